@@ -0,0 +1,147 @@
+"""
+HTTP client for the Diabetes Prediction API, used by the Streamlit app in API mode
+
+One pooled keep-alive session is shared by every Streamlit session of a server. Requests
+time out instead of hanging the UI, and connection errors and 502/503/504 responses are
+retried with backoff (honouring the API's Retry-After when it is overloaded). Batches
+travel as packed float32 rows. Nothing here needs TensorFlow, so neither does the UI.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_URL = os.getenv("DIABETES_API_URL", "http://localhost:8000")
+API_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DIABETES_API_CONNECT_TIMEOUT_SECONDS", "2"))
+API_READ_TIMEOUT_SECONDS = float(os.getenv("DIABETES_API_READ_TIMEOUT_SECONDS", "10"))
+API_RETRIES = int(os.getenv("DIABETES_API_RETRIES", "3"))
+API_POOL_SIZE = int(os.getenv("DIABETES_API_POOL_SIZE", "10"))
+API_BATCH_SIZE = int(os.getenv("DIABETES_API_BATCH_SIZE", "10000"))  # Rows per /predict/batch request
+
+# Column order of packed float32 batch bodies
+API_FEATURES = (
+    "gender",
+    "age",
+    "hypertension",
+    "heart_disease",
+    "bmi",
+    "hba1c_level",
+    "blood_glucose_level",
+    "is_smoker",
+)
+# Confidence codes of packed float32 batch responses
+CONFIDENCE_LEVELS = np.array(["High", "Medium", "Low"])
+
+# Same mapping as the API and the notebooks: only current/former/ever smokers count as smokers
+SMOKERS = {"current", "former", "ever"}
+
+
+class APIError(Exception):
+    """The API could not be reached or rejected the request"""
+
+
+def patient_request(gender: str, age: float, hypertension: int, heart_disease: int, bmi: float,
+                    hba1c_level: float, blood_glucose_level: float, smoking_history: str) -> dict:
+    """Convert the form's values to a /api/v1/predict request body"""
+    return {
+        "gender": 1 if gender == "Male" else 0,
+        "age": float(age),
+        "hypertension": int(hypertension),
+        "heart_disease": int(heart_disease),
+        "bmi": float(bmi),
+        "hba1c_level": float(hba1c_level),
+        "blood_glucose_level": float(blood_glucose_level),
+        "is_smoker": 1 if smoking_history in SMOKERS else 0,
+    }
+
+
+def patient_features(patients: pd.DataFrame) -> np.ndarray:
+    """``patient_request`` for a table of form values: an (N, 8) float32 array in API_FEATURES order"""
+    columns = {
+        "gender": patients["gender"] == "Male",
+        "is_smoker": patients["smoking_history"].isin(SMOKERS),
+    }
+    return np.column_stack([
+        columns[name] if name in columns else patients[name] for name in API_FEATURES
+    ]).astype("<f4")
+
+
+class DiabetesAPIClient:
+    """Thread-safe client over one pooled ``requests`` session"""
+
+    def __init__(self, base_url: str = API_URL, connect_timeout: float = API_CONNECT_TIMEOUT_SECONDS,
+                 read_timeout: float = API_READ_TIMEOUT_SECONDS, retries: int = API_RETRIES,
+                 pool_size: int = API_POOL_SIZE, batch_size: int = API_BATCH_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = batch_size
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            # Predictions have no side effects, so POSTs are safe to retry
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise APIError(f"Could not reach the prediction API at {self.base_url}: {str(e)}")
+        if not response.ok:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise APIError(f"Prediction API returned {response.status_code}: {detail}")
+        return response
+
+    def health(self) -> dict:
+        """Detailed API health, including the served model"""
+        return self._request("GET", "/api/v1/health/detailed").json()
+
+    def model_info(self) -> dict:
+        return self._request("GET", "/api/v1/model/info").json()
+
+    def predict(self, patient: dict) -> dict:
+        """Score one patient given as a /api/v1/predict request body"""
+        return self._request("POST", "/api/v1/predict", json=patient).json()
+
+    def predict_batch(self, features: np.ndarray) -> pd.DataFrame:
+        """
+        Score an (N, 8) array in API_FEATURES order as packed float32 bodies of up to
+        ``batch_size`` rows, resuming any batch the API cut short at its time budget.
+        """
+        features = np.ascontiguousarray(features, dtype="<f4")
+        scored = []
+        start = 0
+        while start < len(features):
+            response = self._request(
+                "POST", "/api/v1/predict/batch",
+                data=features[start:start + self.batch_size].tobytes(),
+                headers={"Content-Type": "application/octet-stream"}
+            )
+            rows = np.frombuffer(response.content, dtype="<f4").reshape(-1, 3)
+            if not len(rows):
+                raise APIError("Prediction API returned no predictions for a batch")
+            scored.append(rows)
+            start += len(rows)
+        rows = np.concatenate(scored) if scored else np.empty((0, 3), dtype="<f4")
+        return pd.DataFrame({
+            "prediction": rows[:, 0].astype(np.int8),
+            "probability": rows[:, 1],
+            "confidence": CONFIDENCE_LEVELS[rows[:, 2].astype(np.intp)],
+        })
+
+    def close(self):
+        self.session.close()
+
@@ -0,0 +1,7 @@
+"""
+Diabetes prediction API package
+"""
+# Installed before anything else is imported so the startup report covers every package
+from app.core.importtime import import_timer
+
+import_timer.install()
@@ -1,6 +1,7 @@
 """
 Health check endpoints
 """
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends
 from app.models.schemas import HealthResponse
 from app.services.model_service import ModelService
@@ -33,5 +34,5 @@ async def detailed_health_check(model_service: ModelService = Depends(get_model_
         "message": "Diabetes Prediction API is running",
         "version": "1.0.0",
         "model": model_info,
-        "timestamp": "2024-01-01T00:00:00Z"  # In production, use actual timestamp
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
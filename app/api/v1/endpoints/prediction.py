@@ -1,18 +1,51 @@
 """
 Prediction endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.background import BackgroundTask
+from typing import List, Optional
+import time
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import PARTIAL_BATCHES, REJECTED_REQUESTS, observe_stage, track_stage
 from app.models.schemas import (
     PredictionRequest, 
     PredictionResponse, 
     BatchPredictionRequest, 
     BatchPredictionResponse
 )
+from app.services.batch_formats import (
+    MEDIA_TYPES,
+    BatchFormatError,
+    BatchValidationError,
+    batch_format,
+    decode_batch,
+    encode_results,
+    validate_batch
+)
+from app.services.executor import InferenceQueueFullError
 from app.services.model_service import ModelService
 
 router = APIRouter()
 
+# The batch endpoint reads its body itself so it can accept binary formats; document the JSON schema by hand
+_batch_schema = BatchPredictionRequest.model_json_schema(ref_template="#/components/schemas/{model}")
+_batch_schema.pop("$defs", None)
+BATCH_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": _batch_schema},
+            "application/vnd.apache.arrow.stream": {"schema": {"type": "string", "format": "binary"}},
+            "application/msgpack": {"schema": {"type": "string", "format": "binary"}},
+            "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+        },
+    }
+}
+
 def get_model_service() -> ModelService:
     """Dependency to get model service"""
     from app.main import model_service
@@ -20,9 +53,30 @@ def get_model_service() -> ModelService:
         raise HTTPException(status_code=503, detail="Model service not available")
     return model_service
 
+def _overloaded(e: InferenceQueueFullError) -> HTTPException:
+    """503 response telling the client to back off and retry"""
+    REJECTED_REQUESTS.inc()
+    return HTTPException(
+        status_code=503,
+        detail=f"Server overloaded: {str(e)}",
+        headers={"Retry-After": "1"}
+    )
+
+def _observe_validation(http_request: Request):
+    """Time from request arrival (body read, parsing, validation) until the endpoint runs"""
+    received_at = getattr(http_request.state, "received_at", None)
+    if received_at is not None:
+        observe_stage("validation", time.perf_counter() - received_at)
+
+def _json_response(payload: BaseModel) -> Response:
+    """Serialize an already-validated response model directly to JSON"""
+    with track_stage("serialization"):
+        return Response(content=payload.model_dump_json(), media_type="application/json")
+
 @router.post("/predict", response_model=PredictionResponse)
 async def predict_diabetes(
     request: PredictionRequest,
+    http_request: Request,
     model_service: ModelService = Depends(get_model_service)
 ):
     """
@@ -37,36 +91,127 @@ async def predict_diabetes(
     - **blood_glucose_level**: Blood glucose level
     - **is_smoker**: Smoking status (0=No, 1=Yes)
     """
+    _observe_validation(http_request)
     try:
-        prediction = model_service.predict(request)
-        return prediction
+        prediction = await model_service.predict_async(request)
+        return _json_response(prediction)
+    except InferenceQueueFullError as e:
+        raise _overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
-@router.post("/predict/batch", response_model=BatchPredictionResponse)
+@router.post("/predict/batch", response_model=BatchPredictionResponse, openapi_extra=BATCH_OPENAPI)
 async def predict_diabetes_batch(
-    request: BatchPredictionRequest,
+    http_request: Request,
     model_service: ModelService = Depends(get_model_service)
 ):
     """
     Predict diabetes risk for multiple patients
     
     - **patients**: List of patient data for batch prediction
+    
+    Besides JSON, the body may be Apache Arrow IPC (`application/vnd.apache.arrow.stream`),
+    MessagePack (`application/msgpack`) or packed little-endian float32 rows of the eight
+    features (`application/octet-stream`); the response uses the same format.
+    
+    Up to MAX_BATCH_SIZE patients are scored in chunks. If BATCH_TIME_BUDGET_SECONDS runs out,
+    the predictions for the first patients are returned with `complete` set to false.
     """
+    body_format = batch_format(http_request.headers.get("content-type"))
+    if body_format is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Content-Type must be one of: {', '.join(sorted(set(MEDIA_TYPES.values())))}"
+        )
+    body = await http_request.body()
+    
+    # Decoding and range checks work on whole columns; no per-patient models are built
+    try:
+        features = decode_batch(body, body_format)
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+    except BatchFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(features) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size too large. Maximum {settings.MAX_BATCH_SIZE} patients per request."
+        )
+    try:
+        validate_batch(features, body_format)
+    except BatchValidationError as e:
+        raise RequestValidationError(e.errors)
+    # JSON is range-checked at float64; the model takes float32
+    features = features.astype(np.float32, copy=False)
+    _observe_validation(http_request)
+    
+    # The budget covers the whole request, from arrival to the last scored chunk
+    deadline = None
+    if settings.BATCH_TIME_BUDGET_SECONDS > 0:
+        received_at = getattr(http_request.state, "received_at", time.perf_counter())
+        deadline = received_at + settings.BATCH_TIME_BUDGET_SECONDS
     try:
-        if len(request.patients) > 100:  # Limit batch size
-            raise HTTPException(status_code=400, detail="Batch size too large. Maximum 100 patients per request.")
-        
-        predictions = model_service.predict_batch(request.patients)
-        
-        return BatchPredictionResponse(
-            predictions=predictions,
-            total_patients=len(predictions)
+        predictions, probabilities, confidences = await model_service.run_in_executor(
+            model_service.predict_arrays, features, deadline
         )
-    except HTTPException:
-        raise
+    except InferenceQueueFullError as e:
+        raise _overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+    
+    complete = len(predictions) == len(features)
+    if not complete:
+        PARTIAL_BATCHES.inc()
+    with track_stage("serialization"):
+        content = encode_results(body_format, predictions, probabilities, confidences, complete)
+    return Response(
+        content=content,
+        media_type=MEDIA_TYPES[body_format],
+        headers={"X-Patients-Processed": str(len(predictions)), "X-Patients-Total": str(len(features))}
+    )
+
+@router.post("/predict/stream")
+async def predict_diabetes_stream(
+    request: Request,
+    output: Optional[str] = None,
+    model_service: ModelService = Depends(get_model_service)
+):
+    """
+    Score a large CSV or NDJSON upload chunk by chunk, streaming the results back
+    
+    - **Content-Type**: `text/csv` or `application/x-ndjson`, one patient per line, in either the
+      API schema or the `diabetes_prediction_dataset.csv` schema
+    - **output**: `csv` or `ndjson` (defaults to the `Accept` header, then the input format)
+    
+    Each output record carries its input `row` index; invalid rows get an `error` instead of a prediction.
+    """
+    # Deferred so pandas is only imported once bulk scoring is actually used
+    from app.services.streaming import iter_file, score_stream, spool_upload, stream_format
+    
+    input_format = stream_format(request.headers.get("content-type"))
+    if input_format is None:
+        raise HTTPException(status_code=415, detail="Content-Type must be text/csv or application/x-ndjson")
+    
+    output_format = output or stream_format(request.headers.get("accept")) or input_format
+    if output_format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="output must be 'csv' or 'ndjson'")
+    
+    upload = await spool_upload(request.stream())
+    return StreamingResponse(
+        score_stream(model_service, iter_file(upload), input_format, output_format, settings.STREAM_CHUNK_ROWS),
+        media_type="text/csv" if output_format == "csv" else "application/x-ndjson",
+        background=BackgroundTask(upload.close)
+    )
+
+@router.get("/model/batching")
+async def get_batching_stats(model_service: ModelService = Depends(get_model_service)):
+    """Get micro-batching queue depth and batch size histograms"""
+    return model_service.get_batching_stats()
+
+@router.get("/model/cache")
+async def get_cache_stats(model_service: ModelService = Depends(get_model_service)):
+    """Get prediction cache hit rate, evictions and size"""
+    return model_service.get_cache_stats()
 
 @router.get("/model/info")
 async def get_model_info(model_service: ModelService = Depends(get_model_service)):
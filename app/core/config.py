@@ -11,10 +11,61 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = True
+    WORKERS: int = 0  # API processes started by app.serve, 0 uses the CPU count
+    STARTUP_IMPORT_BUDGET_SECONDS: float = 2.0  # Import time above this is flagged in the startup report
     
     # Model Configuration
     MODEL_PATH: str = "models/diabetes_model.h5"
     SCALER_PATH: str = "models/scaler.pkl"
+    COMPILED_MODEL_PATH: str = "models/diabetes_model.npz"  # NumPy weights with the scaler folded in
+    ONNX_MODEL_PATH: str = "models/diabetes_model.onnx"  # ONNX export with the scaler folded in
+    SHARED_WEIGHTS_PATH: str = ""  # Memory-mapped weights written by app.serve, shared by all workers
+    
+    # Inference Configuration
+    INFERENCE_BACKEND: str = "numpy"  # "numpy", "onnx" or "keras"
+    PARITY_TOLERANCE: float = 1e-4  # Max abs difference allowed between NumPy/ONNX and Keras outputs
+    ONNX_INTRA_OP_THREADS: int = 1  # ONNX Runtime intra-op threads per session, 0 keeps the default
+    
+    # Quantization Configuration
+    QUANTIZATION: str = ""  # "int8" or "float16" serves the published quantized model (numpy backend)
+    QUANTIZED_MODEL_PATH: str = "models/diabetes_model.{precision}.npz"
+    QUANTIZATION_MAX_RECALL_DROP: float = 0.01  # Publishing is refused beyond these held-out drops
+    QUANTIZATION_MAX_AUC_DROP: float = 0.005
+    DATASET_PATH: str = "data/raw/diabetes_prediction_dataset.csv"
+    HOLDOUT_FRACTION: float = 0.2  # Held-out slice, split like the notebooks (random_state=42)
+    DATASET_CACHE_DIR: str = "data/processed"  # Memory-mapped preprocessed copies of DATASET_PATH, "" disables
+    
+    # Micro-batching Configuration
+    MICRO_BATCHING_ENABLED: bool = True
+    MICRO_BATCH_MAX_SIZE: int = 32  # Max requests coalesced into one forward pass
+    MICRO_BATCH_MAX_WAIT_US: int = 1000  # Max time the first request waits for company
+    
+    # Inference Executor Configuration
+    INFERENCE_WORKERS: int = 2  # Threads running forward passes off the event loop
+    INFERENCE_MAX_QUEUE: int = 256  # Pending work beyond this is rejected with 503
+    TF_INTRA_OP_THREADS: int = 1  # 0 keeps the TensorFlow default
+    TF_INTER_OP_THREADS: int = 1  # 0 keeps the TensorFlow default
+    
+    # Batch Endpoint Configuration
+    MAX_BATCH_SIZE: int = 100000  # Patients accepted per /predict/batch request
+    BATCH_CHUNK_ROWS: int = 0  # Rows per forward pass; 0 sizes chunks to BATCH_CHUNK_CACHE_BYTES
+    BATCH_CHUNK_CACHE_BYTES: int = 1048576  # Activation memory per chunk, sized to stay in L2
+    BATCH_TIME_BUDGET_SECONDS: float = 10.0  # Wall time per batch request before returning partial results, 0 disables
+    
+    # gRPC Configuration
+    GRPC_ENABLED: bool = False  # Serve gRPC from the API process, sharing its ModelService
+    GRPC_HOST: str = "0.0.0.0"
+    GRPC_PORT: int = 50051
+    GRPC_MAX_MESSAGE_BYTES: int = 64 * 1024 * 1024  # Fits MAX_BATCH_SIZE packed rows with room to spare
+    GRPC_STREAM_WINDOW: int = 64  # Streamed patients in flight at once per stream
+    
+    # Prediction Cache Configuration
+    PREDICTION_CACHE_SIZE: int = 10000  # Max cached single predictions, 0 disables the cache
+    PREDICTION_CACHE_TTL_SECONDS: float = 300.0
+    PREDICTION_CACHE_DECIMALS: int = 2  # Feature rounding applied to cache keys
+    
+    # Streaming Configuration
+    STREAM_CHUNK_ROWS: int = 4096  # Rows parsed and scored per forward pass in /predict/stream
     
     # CORS Configuration
     ALLOWED_ORIGINS: list = ["http://localhost:8501", "http://127.0.0.1:8501"]
@@ -0,0 +1,125 @@
+"""
+Import-time accounting for cold starts, in the spirit of ``python -X importtime``
+"""
+import importlib.abc
+import sys
+import threading
+import time
+from typing import List, Tuple
+
+
+class _TimedLoader:
+    """Loader proxy that times ``exec_module`` and otherwise defers to the real loader"""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Module code sees the real loader, never the proxy
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._timer._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._exit()
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Records how long each top-level package takes to import.
+
+    Times are cumulative (a package includes the packages it imports), and
+    ``self`` time excludes nested top-level packages, like ``-X importtime``.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        # (depth, name, cumulative seconds, self seconds) in completion order
+        self.records: List[Tuple[int, str, float, float]] = []
+        self._local = threading.local()
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        if "." in fullname or getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _enter(self, name: str):
+        stack = self._stack()
+        stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        stack = self._stack()
+        name, started, nested = stack.pop()
+        cumulative = time.perf_counter() - started
+        if stack:
+            stack[-1][2] += cumulative
+        self.records.append((len(stack), name, cumulative, cumulative - nested))
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def total_seconds(self) -> float:
+        """Import time of all outermost packages"""
+        return sum(cumulative for depth, _, cumulative, _ in self.records if depth == 0)
+
+    def report(self, budget_seconds: float = 0.0, min_seconds: float = 0.005, max_depth: int = 1) -> str:
+        """Indented breakdown of the slowest imports, outermost packages first"""
+        total = self.total_seconds()
+        header = f"Import time: {total:.2f}s"
+        if budget_seconds:
+            status = "within" if total <= budget_seconds else "OVER"
+            header += f" ({status} budget of {budget_seconds:.2f}s)"
+        lines = [header, f"{'cumulative':>12} | {'self':>8} | package"]
+
+        # Records arrive children first; hold children until their parent completes
+        pending = []
+        for depth, name, cumulative, own in self.records:
+            if depth > max_depth or cumulative < min_seconds:
+                continue
+            row = f"{cumulative * 1000:>9.0f} ms | {own * 1000:>5.0f} ms | {'  ' * depth}{name}"
+            if depth == 0:
+                lines.append(row)
+                lines.extend(pending)
+                pending = []
+            else:
+                pending.append(row)
+        lines.extend(pending)
+        return "\n".join(lines)
+
+
+import_timer = ImportTimer()
@@ -0,0 +1,254 @@
+"""
+Lightweight in-process metrics with Prometheus text exposition
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+POWER_OF_TWO_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    """Cumulative bucket histogram with Prometheus ``le`` semantics"""
+
+    kind = "histogram"
+
+    def __init__(self, buckets: Iterable[float] = POWER_OF_TWO_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one observation"""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        """Cumulative counts per upper bound plus count and sum"""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = count
+
+        return {
+            "buckets": cumulative,
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+        }
+
+    def render(self, name: str, labels: Dict[str, str]) -> List[str]:
+        snapshot = self.snapshot()
+        lines = [
+            f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}"
+            for bound, count in snapshot["buckets"].items()
+        ]
+        lines.append(f"{name}_sum{_format_labels(labels)} {snapshot['sum']}")
+        lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+        return lines
+
+
+class Counter:
+    """Monotonically increasing value"""
+
+    kind = "counter"
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def render(self, name: str, labels: Dict[str, str]) -> List[str]:
+        return [f"{name}{_format_labels(labels)} {self.value}"]
+
+
+class Gauge:
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def render(self, name: str, labels: Dict[str, str]) -> List[str]:
+        return [f"{name}{_format_labels(labels)} {self.value}"]
+
+
+class LabeledMetric:
+    """A family of metrics of one kind, one child per label combination"""
+
+    def __init__(self, factory: Callable, labelnames: Tuple[str, ...]):
+        self.factory = factory
+        self.labelnames = labelnames
+        self.kind = factory().kind
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values) -> object:
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self.factory())
+        return child
+
+    def render(self, name: str, labels: Dict[str, str]) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            lines.extend(child.render(name, {**labels, **dict(zip(self.labelnames, key))}))
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Tuple[str, object]] = {}
+
+    def register(self, name: str, documentation: str, metric):
+        """Add or replace a metric under ``name``"""
+        self._metrics[name] = (documentation, metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        metric = LabeledMetric(Counter, labelnames) if labelnames else Counter()
+        return self.register(name, documentation, metric)
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        metric = LabeledMetric(Gauge, labelnames) if labelnames else Gauge()
+        return self.register(name, documentation, metric)
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS):
+        buckets = tuple(buckets)
+        if labelnames:
+            metric = LabeledMetric(lambda: Histogram(buckets), labelnames)
+        else:
+            metric = Histogram(buckets)
+        return self.register(name, documentation, metric)
+
+    def render(self) -> str:
+        lines = []
+        for name, (documentation, metric) in list(self._metrics.items()):
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render(name, {}))
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_LATENCY = registry.histogram(
+    "diabetes_stage_latency_seconds",
+    "Latency of each prediction stage (validation, preparation, forward, serialization)",
+    labelnames=("stage",),
+)
+REQUEST_LATENCY = registry.histogram(
+    "diabetes_http_request_duration_seconds",
+    "End-to-end HTTP request latency",
+    labelnames=("method", "route", "status"),
+)
+PREDICTIONS = registry.counter(
+    "diabetes_predictions_total",
+    "Predictions served by predicted class and confidence band",
+    labelnames=("prediction", "confidence"),
+)
+INFERENCE_BATCH_SIZE = registry.histogram(
+    "diabetes_inference_batch_size",
+    "Rows per model forward pass",
+    buckets=POWER_OF_TWO_BUCKETS + (4096, 16384, 65536),
+)
+MODEL_LOAD_SECONDS = registry.gauge(
+    "diabetes_model_load_seconds",
+    "Time taken to load the model at startup",
+)
+STARTUP_IMPORT_SECONDS = registry.gauge(
+    "diabetes_startup_import_seconds",
+    "Time spent importing packages during startup",
+)
+STARTUP_SECONDS = registry.gauge(
+    "diabetes_startup_seconds",
+    "Time from importing the app package until the API was ready to serve",
+)
+PARTIAL_BATCHES = registry.counter(
+    "diabetes_partial_batches_total",
+    "Batch requests that ran out of time budget and returned partial results",
+)
+REJECTED_REQUESTS = registry.counter(
+    "diabetes_rejected_requests_total",
+    "Requests rejected with 503 because the inference queue was full",
+)
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_LATENCY.labels(stage).observe(seconds)
+
+
+@contextmanager
+def track_stage(stage: str):
+    """Time the enclosed block as one prediction stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware recording request latency by route and stamping
+    ``request.state.received_at`` so endpoints can time validation
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        scope.setdefault("state", {})["received_at"] = started
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            # Route templates keep label cardinality bounded
+            path = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.labels(scope["method"], path, status).observe(time.perf_counter() - started)
@@ -0,0 +1,71 @@
+"""
+Export a trained Keras model to ONNX for the ONNX Runtime backend
+
+Usage:
+    python -m app.export_onnx
+    python -m app.export_onnx --model notebooks/model.h5 --output notebooks/model.onnx
+
+With the default paths the fitted scaler (or, without one, the API's default feature
+statistics) is folded into the first layer and the artifact fingerprint is recorded, so a server started with INFERENCE_BACKEND=onnx loads the file
+directly. Models whose inputs do not match the API features are exported unscaled.
+"""
+import argparse
+import os
+import sys
+
+from app.core.config import settings
+from app.models.schemas import FEATURE_NAMES
+from app.services.artifacts import artifact_fingerprint, load_scaler, save_compiled_engine
+from app.services.numpy_engine import NumpyInferenceEngine
+from app.services.onnx_engine import OnnxInferenceEngine
+
+
+def export_onnx(model_path: str, output_path: str, scaler_path: str = "",
+                tolerance: float = settings.PARITY_TOLERANCE) -> float:
+    """Convert ``model_path`` to ONNX, check it against Keras and write it, returning the parity error"""
+    from app.services.model_service import _import_tensorflow, standardization_stats
+
+    tf = _import_tensorflow()
+    model = tf.keras.models.load_model(model_path, compile=False)
+    engine = NumpyInferenceEngine.from_keras_model(model)
+
+    error = OnnxInferenceEngine.from_engine(engine).parity_error(model)
+    if error > tolerance:
+        raise ValueError(f"ONNX parity check failed: max error {error:.2e} exceeds {tolerance:.0e}")
+
+    metadata = {}
+    if engine.n_features == len(FEATURE_NAMES):
+        scaler = load_scaler(scaler_path) if scaler_path and os.path.exists(scaler_path) else None
+        # Same float32 statistics as ModelService (its defaults without a scaler), so the export
+        # matches what the server would build itself
+        engine = engine.with_input_scaling(*standardization_stats(scaler))
+        if scaler is not None:
+            print(f"Folded scaler {scaler_path} into the first layer")
+        else:
+            print("No scaler, folded the API's default feature statistics into the first layer")
+        metadata["fingerprint"] = artifact_fingerprint(model_path, scaler_path)
+    else:
+        print(f"Model takes {engine.n_features} features (API provides {len(FEATURE_NAMES)}); exporting unscaled")
+
+    save_compiled_engine(OnnxInferenceEngine.from_engine(engine, **metadata), output_path,
+                         metadata.get("fingerprint", ""), keras_parity_error=f"{error:.3e}")
+    return error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the diabetes model to ONNX")
+    parser.add_argument("--model", default=settings.MODEL_PATH, help="Keras model (.h5 or .keras)")
+    parser.add_argument("--scaler", default=settings.SCALER_PATH, help="Fitted scaler folded into the export")
+    parser.add_argument("--output", default=settings.ONNX_MODEL_PATH, help="ONNX file to write")
+    args = parser.parse_args(argv)
+
+    try:
+        error = export_onnx(args.model, args.output, args.scaler)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Export failed: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Wrote {args.output} (max parity error vs Keras {error:.2e})")
+
+
+if __name__ == "__main__":
+    main()
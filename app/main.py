@@ -2,31 +2,53 @@
 FastAPI application for Diabetes Prediction Neural Network
 """
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import time
 import uvicorn
 
 from app.api.v1.endpoints import prediction, health
 from app.core.config import settings
+from app.core.importtime import import_timer
+from app.core.metrics import RequestTimingMiddleware, STARTUP_IMPORT_SECONDS, STARTUP_SECONDS, registry
 from app.services.model_service import ModelService
 
 # Global model service instance
 model_service = None
+grpc_server = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    global model_service
+    global model_service, grpc_server
     # Startup
     print("Loading diabetes prediction model...")
     model_service = ModelService()
     await model_service.load_model()
     print("Model loaded successfully!")
     
+    if settings.GRPC_ENABLED:
+        # Imported here so REST-only deployments do not need grpcio
+        from app.rpc.server import create_server
+        grpc_server, grpc_port = create_server(model_service)
+        await grpc_server.start()
+        print(f"gRPC serving on {settings.GRPC_HOST}:{grpc_port}")
+    
+    # Cold start report: which imports the startup path paid for, and how long it took overall
+    print(import_timer.report(budget_seconds=settings.STARTUP_IMPORT_BUDGET_SECONDS))
+    startup_seconds = time.perf_counter() - import_timer.started_at
+    STARTUP_IMPORT_SECONDS.set(import_timer.total_seconds())
+    STARTUP_SECONDS.set(startup_seconds)
+    print(f"Startup took {startup_seconds:.2f}s since the app package was imported")
+    
     yield
     
     # Shutdown
     print("Shutting down application...")
+    if grpc_server is not None:
+        await grpc_server.stop(grace=5)
+    await model_service.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
@@ -45,6 +67,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route latency and stamp arrival time for stage timing
+app.add_middleware(RequestTimingMiddleware)
+
 # Include routers
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(prediction.router, prefix="/api/v1", tags=["prediction"])
@@ -58,6 +83,11 @@ async def root():
         "docs": "/docs"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
@@ -1,10 +1,42 @@
 """
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field
 from typing import Optional, List
 import numpy as np
 
+# Model input order of the PredictionRequest features
+FEATURE_NAMES = (
+    "gender",
+    "age",
+    "hypertension",
+    "heart_disease",
+    "bmi",
+    "hba1c_level",
+    "blood_glucose_level",
+    "is_smoker",
+)
+
+# Features standardized with the fitted StandardScaler; the rest are binary
+CONTINUOUS_FEATURES = ("age", "bmi", "hba1c_level", "blood_glucose_level")
+
+# Valid (lower, upper) range of every feature, shared by the request model and batch validation
+FEATURE_RANGES = {
+    "gender": (0, 1),
+    "age": (0, 120),
+    "hypertension": (0, 1),
+    "heart_disease": (0, 1),
+    "bmi": (10, 100),
+    "hba1c_level": (0, 20),
+    "blood_glucose_level": (0, 500),
+    "is_smoker": (0, 1),
+}
+
+def feature_field(name: str, description: str):
+    """Required field constrained to the feature's FEATURE_RANGES entry"""
+    lower, upper = FEATURE_RANGES[name]
+    return Field(..., description=description, ge=lower, le=upper)
+
 class HealthResponse(BaseModel):
     """Health check response model"""
     status: str
@@ -13,26 +45,14 @@ class HealthResponse(BaseModel):
 
 class PredictionRequest(BaseModel):
     """Diabetes prediction request model"""
-    gender: int = Field(..., description="Gender (0=Female, 1=Male)", ge=0, le=1)
-    age: float = Field(..., description="Age in years", ge=0, le=120)
-    hypertension: int = Field(..., description="Hypertension (0=No, 1=Yes)", ge=0, le=1)
-    heart_disease: int = Field(..., description="Heart disease (0=No, 1=Yes)", ge=0, le=1)
-    bmi: float = Field(..., description="Body Mass Index", ge=10, le=100)
-    hba1c_level: float = Field(..., description="HbA1c level", ge=0, le=20)
-    blood_glucose_level: float = Field(..., description="Blood glucose level", ge=0, le=500)
-    is_smoker: int = Field(..., description="Smoking status (0=No, 1=Yes)", ge=0, le=1)
-    
-    @validator('age')
-    def validate_age(cls, v):
-        if v < 0 or v > 120:
-            raise ValueError('Age must be between 0 and 120')
-        return v
-    
-    @validator('bmi')
-    def validate_bmi(cls, v):
-        if v < 10 or v > 100:
-            raise ValueError('BMI must be between 10 and 100')
-        return v
+    gender: int = feature_field("gender", "Gender (0=Female, 1=Male)")
+    age: float = feature_field("age", "Age in years")
+    hypertension: int = feature_field("hypertension", "Hypertension (0=No, 1=Yes)")
+    heart_disease: int = feature_field("heart_disease", "Heart disease (0=No, 1=Yes)")
+    bmi: float = feature_field("bmi", "Body Mass Index")
+    hba1c_level: float = feature_field("hba1c_level", "HbA1c level")
+    blood_glucose_level: float = feature_field("blood_glucose_level", "Blood glucose level")
+    is_smoker: int = feature_field("is_smoker", "Smoking status (0=No, 1=Yes)")
 
 class PredictionResponse(BaseModel):
     """Diabetes prediction response model"""
@@ -48,3 +68,4 @@ class BatchPredictionResponse(BaseModel):
     """Batch prediction response model"""
     predictions: List[PredictionResponse] = Field(..., description="List of predictions")
     total_patients: int = Field(..., description="Total number of patients processed")
+    complete: bool = Field(True, description="False when the time budget ran out; resubmit the patients from index total_patients")
@@ -0,0 +1,110 @@
+"""
+Quantize the trained model to int8 or float16 and publish it only if it stays accurate
+
+Usage:
+    python -m app.quantize --precision int8
+    python -m app.quantize --precision float16 --max-recall-drop 0.005
+
+The full-precision and quantized models are both scored on the held-out slice of
+DATASET_PATH (the notebooks' 80/20 split). The quantized model is written to
+QUANTIZED_MODEL_PATH only if recall and AUC drop by no more than the tolerances;
+serve it with QUANTIZATION=<precision>.
+"""
+import argparse
+import os
+import sys
+
+from app.core.config import settings
+from app.services.artifacts import artifact_fingerprint, load_scaler, save_compiled_engine
+from app.services.evaluation import evaluate, holdout_indices, load_labeled_dataset
+from app.services.numpy_engine import NumpyInferenceEngine
+from app.services.quantization import QUANTIZATION_PRECISIONS, QuantizedInferenceEngine
+
+
+def quantize_model(precision: str, dataset_path: str = settings.DATASET_PATH,
+                   holdout_fraction: float = settings.HOLDOUT_FRACTION,
+                   max_recall_drop: float = settings.QUANTIZATION_MAX_RECALL_DROP,
+                   max_auc_drop: float = settings.QUANTIZATION_MAX_AUC_DROP) -> dict:
+    """Quantize, evaluate against full precision and publish if within tolerance"""
+    from app.services.model_service import ModelService, standardization_stats
+
+    if not os.path.exists(settings.MODEL_PATH):
+        raise ValueError(f"No trained model at {settings.MODEL_PATH} to quantize")
+    # The reference is always the full-precision NumPy engine, whatever is being served
+    quantization, backend = settings.QUANTIZATION, settings.INFERENCE_BACKEND
+    settings.QUANTIZATION = ""
+    settings.INFERENCE_BACKEND = "numpy"
+    try:
+        service = ModelService()
+        service.load_artifacts()
+    finally:
+        settings.QUANTIZATION = quantization
+        settings.INFERENCE_BACKEND = backend
+    if type(service.engine) is not NumpyInferenceEngine:
+        raise ValueError(f"Quantization needs the NumPy engine, got the {service.backend} backend")
+
+    features, labels = load_labeled_dataset(dataset_path, settings.DATASET_CACHE_DIR)
+    _, test = holdout_indices(len(labels), holdout_fraction)
+    features, labels = features[test], labels[test]
+
+    # Quantize the weights as trained, on standardized inputs, and fold the scaler in afterwards:
+    # folded first-layer columns mix raw features of very different sizes and int8 would zero the small ones
+    scaler = load_scaler(settings.SCALER_PATH) if os.path.exists(settings.SCALER_PATH) else None
+    mean, scale = standardization_stats(scaler)
+    quantized = QuantizedInferenceEngine.from_engine(NumpyInferenceEngine.from_h5(settings.MODEL_PATH), precision,
+                                                     mean, scale)
+    reference_metrics = evaluate(service.engine, features, labels)
+    quantized_metrics = evaluate(quantized, features, labels)
+    recall_drop = reference_metrics["recall"] - quantized_metrics["recall"]
+    auc_drop = reference_metrics["auc"] - quantized_metrics["auc"]
+
+    report = {
+        "precision": precision,
+        "reference": reference_metrics,
+        "quantized": quantized_metrics,
+        "recall_drop": recall_drop,
+        "auc_drop": auc_drop,
+        "path": settings.QUANTIZED_MODEL_PATH.format(precision=precision),
+        "published": recall_drop <= max_recall_drop and auc_drop <= max_auc_drop,
+    }
+    if report["published"]:
+        fingerprint = artifact_fingerprint(settings.MODEL_PATH, settings.SCALER_PATH)
+        save_compiled_engine(quantized, report["path"], fingerprint,
+                             holdout_recall=f"{quantized_metrics['recall']:.6f}",
+                             holdout_auc=f"{quantized_metrics['auc']:.6f}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quantize the diabetes model with accuracy guardrails")
+    parser.add_argument("--precision", choices=QUANTIZATION_PRECISIONS, default="int8")
+    parser.add_argument("--dataset", default=settings.DATASET_PATH, help="Labelled CSV for the held-out evaluation")
+    parser.add_argument("--holdout-fraction", type=float, default=settings.HOLDOUT_FRACTION)
+    parser.add_argument("--max-recall-drop", type=float, default=settings.QUANTIZATION_MAX_RECALL_DROP)
+    parser.add_argument("--max-auc-drop", type=float, default=settings.QUANTIZATION_MAX_AUC_DROP)
+    args = parser.parse_args(argv)
+
+    try:
+        report = quantize_model(args.precision, args.dataset, args.holdout_fraction,
+                                args.max_recall_drop, args.max_auc_drop)
+    except (OSError, ValueError) as e:
+        print(f"Quantization failed: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+    reference, quantized = report["reference"], report["quantized"]
+    print(f"Held-out rows: {reference['rows']}")
+    print(f"{'':10} {'recall':>8} {'auc':>8}")
+    print(f"{'float32':10} {reference['recall']:8.4f} {reference['auc']:8.4f}")
+    print(f"{args.precision:10} {quantized['recall']:8.4f} {quantized['auc']:8.4f}")
+    if not report["published"]:
+        print(
+            f"Refusing to publish: recall drop {report['recall_drop']:+.4f} (max {args.max_recall_drop}), "
+            f"AUC drop {report['auc_drop']:+.4f} (max {args.max_auc_drop})",
+            file=sys.stderr
+        )
+        sys.exit(1)
+    print(f"Published {report['path']}; serve it with QUANTIZATION={args.precision}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+gRPC interface to the diabetes prediction model
+"""
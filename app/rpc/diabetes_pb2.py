@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: app/rpc/diabetes.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'app/rpc/diabetes.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16\x61pp/rpc/diabetes.proto\x12\x0b\x64iabetes.v1\"\xb1\x01\n\x07Patient\x12\x0e\n\x06gender\x18\x01 \x01(\x05\x12\x0b\n\x03\x61ge\x18\x02 \x01(\x02\x12\x14\n\x0chypertension\x18\x03 \x01(\x05\x12\x15\n\rheart_disease\x18\x04 \x01(\x05\x12\x0b\n\x03\x62mi\x18\x05 \x01(\x02\x12\x13\n\x0bhba1c_level\x18\x06 \x01(\x02\x12\x1b\n\x13\x62lood_glucose_level\x18\x07 \x01(\x02\x12\x11\n\tis_smoker\x18\x08 \x01(\x05\x12\n\n\x02id\x18\t \x01(\t\"}\n\nPrediction\x12\x12\n\nprediction\x18\x01 \x01(\x05\x12\x13\n\x0bprobability\x18\x02 \x01(\x02\x12+\n\nconfidence\x18\x03 \x01(\x0e\x32\x17.diabetes.v1.Confidence\x12\n\n\x02id\x18\x04 \x01(\t\x12\r\n\x05\x65rror\x18\x05 \x01(\t\" \n\x0c\x42\x61tchRequest\x12\x10\n\x08\x66\x65\x61tures\x18\x01 \x03(\x02\"\x93\x01\n\rBatchResponse\x12\x13\n\x0bpredictions\x18\x01 \x03(\x05\x12\x15\n\rprobabilities\x18\x02 \x03(\x02\x12,\n\x0b\x63onfidences\x18\x03 \x03(\x0e\x32\x17.diabetes.v1.Confidence\x12\x16\n\x0etotal_patients\x18\x04 \x01(\x05\x12\x10\n\x08\x63omplete\x18\x05 \x01(\x08*L\n\nConfidence\x12\x13\n\x0f\x43ONFIDENCE_HIGH\x10\x00\x12\x15\n\x11\x43ONFIDENCE_MEDIUM\x10\x01\x12\x12\n\x0e\x43ONFIDENCE_LOW\x10\x02\x32\xd9\x01\n\x12\x44iabetesPrediction\x12\x38\n\x07Predict\x12\x14.diabetes.v1.Patient\x1a\x17.diabetes.v1.Prediction\x12\x45\n\x0cPredictBatch\x12\x19.diabetes.v1.BatchRequest\x1a\x1a.diabetes.v1.BatchResponse\x12\x42\n\rPredictStream\x12\x14.diabetes.v1.Patient\x1a\x17.diabetes.v1.Prediction(\x01\x30\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'app.rpc.diabetes_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_CONFIDENCE']._serialized_start=530
+  _globals['_CONFIDENCE']._serialized_end=606
+  _globals['_PATIENT']._serialized_start=40
+  _globals['_PATIENT']._serialized_end=217
+  _globals['_PREDICTION']._serialized_start=219
+  _globals['_PREDICTION']._serialized_end=344
+  _globals['_BATCHREQUEST']._serialized_start=346
+  _globals['_BATCHREQUEST']._serialized_end=378
+  _globals['_BATCHRESPONSE']._serialized_start=381
+  _globals['_BATCHRESPONSE']._serialized_end=528
+  _globals['_DIABETESPREDICTION']._serialized_start=609
+  _globals['_DIABETESPREDICTION']._serialized_end=826
+# @@protoc_insertion_point(module_scope)
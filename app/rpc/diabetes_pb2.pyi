@@ -0,0 +1,73 @@
+from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from collections.abc import Iterable as _Iterable
+from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class Confidence(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    CONFIDENCE_HIGH: _ClassVar[Confidence]
+    CONFIDENCE_MEDIUM: _ClassVar[Confidence]
+    CONFIDENCE_LOW: _ClassVar[Confidence]
+CONFIDENCE_HIGH: Confidence
+CONFIDENCE_MEDIUM: Confidence
+CONFIDENCE_LOW: Confidence
+
+class Patient(_message.Message):
+    __slots__ = ("gender", "age", "hypertension", "heart_disease", "bmi", "hba1c_level", "blood_glucose_level", "is_smoker", "id")
+    GENDER_FIELD_NUMBER: _ClassVar[int]
+    AGE_FIELD_NUMBER: _ClassVar[int]
+    HYPERTENSION_FIELD_NUMBER: _ClassVar[int]
+    HEART_DISEASE_FIELD_NUMBER: _ClassVar[int]
+    BMI_FIELD_NUMBER: _ClassVar[int]
+    HBA1C_LEVEL_FIELD_NUMBER: _ClassVar[int]
+    BLOOD_GLUCOSE_LEVEL_FIELD_NUMBER: _ClassVar[int]
+    IS_SMOKER_FIELD_NUMBER: _ClassVar[int]
+    ID_FIELD_NUMBER: _ClassVar[int]
+    gender: int
+    age: float
+    hypertension: int
+    heart_disease: int
+    bmi: float
+    hba1c_level: float
+    blood_glucose_level: float
+    is_smoker: int
+    id: str
+    def __init__(self, gender: _Optional[int] = ..., age: _Optional[float] = ..., hypertension: _Optional[int] = ..., heart_disease: _Optional[int] = ..., bmi: _Optional[float] = ..., hba1c_level: _Optional[float] = ..., blood_glucose_level: _Optional[float] = ..., is_smoker: _Optional[int] = ..., id: _Optional[str] = ...) -> None: ...
+
+class Prediction(_message.Message):
+    __slots__ = ("prediction", "probability", "confidence", "id", "error")
+    PREDICTION_FIELD_NUMBER: _ClassVar[int]
+    PROBABILITY_FIELD_NUMBER: _ClassVar[int]
+    CONFIDENCE_FIELD_NUMBER: _ClassVar[int]
+    ID_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    prediction: int
+    probability: float
+    confidence: Confidence
+    id: str
+    error: str
+    def __init__(self, prediction: _Optional[int] = ..., probability: _Optional[float] = ..., confidence: _Optional[_Union[Confidence, str]] = ..., id: _Optional[str] = ..., error: _Optional[str] = ...) -> None: ...
+
+class BatchRequest(_message.Message):
+    __slots__ = ("features",)
+    FEATURES_FIELD_NUMBER: _ClassVar[int]
+    features: _containers.RepeatedScalarFieldContainer[float]
+    def __init__(self, features: _Optional[_Iterable[float]] = ...) -> None: ...
+
+class BatchResponse(_message.Message):
+    __slots__ = ("predictions", "probabilities", "confidences", "total_patients", "complete")
+    PREDICTIONS_FIELD_NUMBER: _ClassVar[int]
+    PROBABILITIES_FIELD_NUMBER: _ClassVar[int]
+    CONFIDENCES_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_PATIENTS_FIELD_NUMBER: _ClassVar[int]
+    COMPLETE_FIELD_NUMBER: _ClassVar[int]
+    predictions: _containers.RepeatedScalarFieldContainer[int]
+    probabilities: _containers.RepeatedScalarFieldContainer[float]
+    confidences: _containers.RepeatedScalarFieldContainer[Confidence]
+    total_patients: int
+    complete: bool
+    def __init__(self, predictions: _Optional[_Iterable[int]] = ..., probabilities: _Optional[_Iterable[float]] = ..., confidences: _Optional[_Iterable[_Union[Confidence, str]]] = ..., total_patients: _Optional[int] = ..., complete: _Optional[bool] = ...) -> None: ...
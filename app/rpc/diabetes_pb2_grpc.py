@@ -0,0 +1,186 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from app.rpc import diabetes_pb2 as app_dot_rpc_dot_diabetes__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in app/rpc/diabetes_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class DiabetesPredictionStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Predict = channel.unary_unary(
+                '/diabetes.v1.DiabetesPrediction/Predict',
+                request_serializer=app_dot_rpc_dot_diabetes__pb2.Patient.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_diabetes__pb2.Prediction.FromString,
+                _registered_method=True)
+        self.PredictBatch = channel.unary_unary(
+                '/diabetes.v1.DiabetesPrediction/PredictBatch',
+                request_serializer=app_dot_rpc_dot_diabetes__pb2.BatchRequest.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_diabetes__pb2.BatchResponse.FromString,
+                _registered_method=True)
+        self.PredictStream = channel.stream_stream(
+                '/diabetes.v1.DiabetesPrediction/PredictStream',
+                request_serializer=app_dot_rpc_dot_diabetes__pb2.Patient.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_diabetes__pb2.Prediction.FromString,
+                _registered_method=True)
+
+
+class DiabetesPredictionServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def Predict(self, request, context):
+        """One patient; concurrent calls are coalesced by the micro-batcher and served from the cache
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PredictBatch(self, request, context):
+        """Many patients as packed float32 rows, scored in one call
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PredictStream(self, request_iterator, context):
+        """Continuous scoring: one prediction per patient, in arrival order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_DiabetesPredictionServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Predict': grpc.unary_unary_rpc_method_handler(
+                    servicer.Predict,
+                    request_deserializer=app_dot_rpc_dot_diabetes__pb2.Patient.FromString,
+                    response_serializer=app_dot_rpc_dot_diabetes__pb2.Prediction.SerializeToString,
+            ),
+            'PredictBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.PredictBatch,
+                    request_deserializer=app_dot_rpc_dot_diabetes__pb2.BatchRequest.FromString,
+                    response_serializer=app_dot_rpc_dot_diabetes__pb2.BatchResponse.SerializeToString,
+            ),
+            'PredictStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.PredictStream,
+                    request_deserializer=app_dot_rpc_dot_diabetes__pb2.Patient.FromString,
+                    response_serializer=app_dot_rpc_dot_diabetes__pb2.Prediction.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'diabetes.v1.DiabetesPrediction', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('diabetes.v1.DiabetesPrediction', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class DiabetesPrediction:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Predict(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/diabetes.v1.DiabetesPrediction/Predict',
+            app_dot_rpc_dot_diabetes__pb2.Patient.SerializeToString,
+            app_dot_rpc_dot_diabetes__pb2.Prediction.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PredictBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/diabetes.v1.DiabetesPrediction/PredictBatch',
+            app_dot_rpc_dot_diabetes__pb2.BatchRequest.SerializeToString,
+            app_dot_rpc_dot_diabetes__pb2.BatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PredictStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/diabetes.v1.DiabetesPrediction/PredictStream',
+            app_dot_rpc_dot_diabetes__pb2.Patient.SerializeToString,
+            app_dot_rpc_dot_diabetes__pb2.Prediction.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
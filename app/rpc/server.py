@@ -0,0 +1,184 @@
+"""
+gRPC server sharing a ModelService with the REST API
+
+Usage:
+    python -m app.rpc.server --port 50051
+
+With GRPC_ENABLED=true the API process serves gRPC from its own ModelService instead;
+run this module for a standalone sibling process (it maps SHARED_WEIGHTS_PATH when the
+multi-worker supervisor has exported the weights).
+"""
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator, Tuple
+
+import grpc
+import numpy as np
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.metrics import PARTIAL_BATCHES, REJECTED_REQUESTS
+from app.models.schemas import FEATURE_NAMES, PredictionRequest, PredictionResponse
+from app.rpc import diabetes_pb2, diabetes_pb2_grpc
+from app.services.batch_formats import N_FEATURES, BatchValidationError, validate_batch
+from app.services.executor import InferenceQueueFullError
+from app.services.model_service import CONFIDENCE_LEVELS, ModelService
+
+CONFIDENCE_CODES = {level: code for code, level in enumerate(CONFIDENCE_LEVELS)}
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+
+
+def _batch_validation_message(e: BatchValidationError) -> str:
+    return "; ".join(f"row {error['loc'][1]} {error['loc'][2]}: {error['msg']}" for error in e.errors)
+
+
+class PredictionServicer(diabetes_pb2_grpc.DiabetesPredictionServicer):
+    """Implements DiabetesPrediction on top of a loaded ModelService"""
+
+    def __init__(self, model_service: ModelService):
+        self.model_service = model_service
+
+    async def _predict_patient(self, patient: diabetes_pb2.Patient) -> PredictionResponse:
+        request = PredictionRequest(**{name: getattr(patient, name) for name in FEATURE_NAMES})
+        return await self.model_service.predict_async(request)
+
+    @staticmethod
+    def _to_message(response: PredictionResponse, patient_id: str) -> diabetes_pb2.Prediction:
+        return diabetes_pb2.Prediction(
+            prediction=response.prediction,
+            probability=response.probability,
+            confidence=CONFIDENCE_CODES[response.confidence],
+            id=patient_id
+        )
+
+    async def Predict(self, request: diabetes_pb2.Patient, context) -> diabetes_pb2.Prediction:
+        try:
+            response = await self._predict_patient(request)
+        except ValidationError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, _validation_message(e))
+        except InferenceQueueFullError as e:
+            REJECTED_REQUESTS.inc()
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f"Server overloaded: {str(e)}")
+        return self._to_message(response, request.id)
+
+    async def PredictBatch(self, request: diabetes_pb2.BatchRequest, context) -> diabetes_pb2.BatchResponse:
+        started = time.perf_counter()
+        if len(request.features) % N_FEATURES:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                                f"features must hold a multiple of {N_FEATURES} values")
+        features = np.array(request.features, dtype=np.float32).reshape(-1, N_FEATURES)
+        if len(features) > settings.MAX_BATCH_SIZE:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                                f"Batch size too large. Maximum {settings.MAX_BATCH_SIZE} patients per request.")
+        try:
+            validate_batch(features, "float32")
+        except BatchValidationError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, _batch_validation_message(e))
+
+        # The tighter of the server's budget and the client's deadline, keeping half of the
+        # client's remaining time for building and sending the response
+        budgets = [settings.BATCH_TIME_BUDGET_SECONDS] if settings.BATCH_TIME_BUDGET_SECONDS > 0 else []
+        if context.time_remaining() is not None:
+            budgets.append(context.time_remaining() / 2)
+        deadline = started + min(budgets) if budgets else None
+        try:
+            predictions, probabilities, confidences = await self.model_service.run_in_executor(
+                self.model_service.predict_arrays, features, deadline
+            )
+        except InferenceQueueFullError as e:
+            REJECTED_REQUESTS.inc()
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f"Server overloaded: {str(e)}")
+
+        complete = len(predictions) == len(features)
+        if not complete:
+            PARTIAL_BATCHES.inc()
+        codes = (confidences == "Medium") + 2 * (confidences == "Low")
+        return diabetes_pb2.BatchResponse(
+            predictions=predictions.tolist(),
+            probabilities=probabilities.tolist(),
+            confidences=codes.tolist(),
+            total_patients=len(predictions),
+            complete=complete
+        )
+
+    async def PredictStream(self, request_iterator: AsyncIterator[diabetes_pb2.Patient],
+                            context) -> AsyncIterator[diabetes_pb2.Prediction]:
+        # Up to GRPC_STREAM_WINDOW patients are in flight at once, so the micro-batcher can
+        # coalesce them; results are still sent in arrival order
+        pending: asyncio.Queue = asyncio.Queue(maxsize=settings.GRPC_STREAM_WINDOW)
+
+        async def read_patients():
+            async for patient in request_iterator:
+                await pending.put((patient.id, asyncio.ensure_future(self._predict_patient(patient))))
+            await pending.put(None)
+
+        reader = asyncio.ensure_future(read_patients())
+        try:
+            while True:
+                item = await pending.get()
+                if item is None:
+                    break
+                patient_id, task = item
+                try:
+                    yield self._to_message(await task, patient_id)
+                except ValidationError as e:
+                    yield diabetes_pb2.Prediction(id=patient_id, error=_validation_message(e))
+                except InferenceQueueFullError as e:
+                    # Like the REST 503, only this patient is rejected; the stream and the
+                    # patients already in flight carry on and the client can resend it
+                    REJECTED_REQUESTS.inc()
+                    yield diabetes_pb2.Prediction(id=patient_id, error=f"Server overloaded: {str(e)}")
+            await reader
+        finally:
+            reader.cancel()
+            while not pending.empty():
+                item = pending.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+
+
+def create_server(model_service: ModelService, host: str = settings.GRPC_HOST,
+                  port: int = settings.GRPC_PORT) -> Tuple[grpc.aio.Server, int]:
+    """gRPC server serving ``model_service`` and the port it bound (``port`` 0 picks a free one); the caller starts it"""
+    server = grpc.aio.server(options=[
+        ("grpc.max_receive_message_length", settings.GRPC_MAX_MESSAGE_BYTES),
+        ("grpc.max_send_message_length", settings.GRPC_MAX_MESSAGE_BYTES),
+        # Lets every multi-worker process bind the same port; the kernel spreads connections
+        ("grpc.so_reuseport", 1),
+    ])
+    diabetes_pb2_grpc.add_DiabetesPredictionServicer_to_server(PredictionServicer(model_service), server)
+    bound_port = server.add_insecure_port(f"{host}:{port}")
+    return server, bound_port
+
+
+async def serve(host: str, port: int):
+    """Load the model and serve gRPC until cancelled"""
+    model_service = ModelService()
+    await model_service.load_model()
+    server, bound_port = create_server(model_service, host, port)
+    await server.start()
+    print(f"gRPC serving on {host}:{bound_port}")
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(grace=5)
+        await model_service.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve diabetes predictions over gRPC")
+    parser.add_argument("--host", default=settings.GRPC_HOST)
+    parser.add_argument("--port", type=int, default=settings.GRPC_PORT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """
 Run the FastAPI application
 """
+import argparse
 import uvicorn
 import sys
 import os
@@ -13,6 +14,16 @@ sys.path.insert(0, str(parent_dir))
 from app.main import app
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the diabetes prediction API")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; more than 1 runs the production server without reload")
+    args = parser.parse_args()
+    
+    if args.workers > 1:
+        from app.serve import main
+        main(["--workers", str(args.workers)])
+        sys.exit(0)
+    
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
@@ -0,0 +1,184 @@
+"""
+Offline batch scoring of patient files without the HTTP server
+
+Usage:
+    python -m app.score data/raw/diabetes_prediction_dataset.csv scores.csv
+    python -m app.score patients.csv scores.parquet --workers 4 --chunk-size 20000
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.encoding import encode_frame
+from app.services.validation import row_errors
+
+# Per-process model service, set up by _init_worker
+_service = None
+
+
+def _init_worker(engine):
+    """Load the model once per worker process"""
+    global _service
+    from app.services.model_service import ModelService
+
+    _service = ModelService()
+    if engine is not None:
+        _service.use_engine(engine)
+    else:
+        _service.load_artifacts()
+
+
+def score_frame(df: pd.DataFrame, service=None) -> pd.DataFrame:
+    """Append prediction, probability, confidence and error columns to a chunk"""
+    service = service or _service
+    features = encode_frame(df)
+    errors = row_errors(features)
+    valid = np.array([error is None for error in errors], dtype=bool)
+
+    predictions = np.full(len(df), pd.NA, dtype=object)
+    probabilities = np.full(len(df), np.nan, dtype=np.float32)
+    confidences = np.full(len(df), None, dtype=object)
+    if valid.any():
+        pred, proba, conf = service.predict_arrays(features[valid])
+        predictions[valid] = pred
+        probabilities[valid] = proba
+        confidences[valid] = conf
+
+    scored = df.copy()
+    scored["prediction"] = pd.array(predictions, dtype="Int8")
+    scored["probability"] = probabilities
+    scored["confidence"] = confidences
+    scored["error"] = errors
+    return scored
+
+
+class ScoreWriter:
+    """Writes scored chunks in order to CSV or Parquet, chosen by file extension"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.is_parquet = path.endswith(".parquet")
+        self._parquet_writer = None
+        self._wrote_header = False
+        if self.is_parquet:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise SystemExit("Writing Parquet requires pyarrow (pip install pyarrow)")
+
+    def write(self, chunk: pd.DataFrame):
+        if self.is_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, self._parquet_schema(chunk))
+            table = pa.Table.from_pandas(chunk, schema=self._parquet_writer.schema, preserve_index=False)
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode="a" if self._wrote_header else "w",
+                         header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    @staticmethod
+    def _parquet_schema(chunk: pd.DataFrame):
+        """
+        One schema for every chunk: fixed types for the score columns, the first chunk's for the input.
+
+        Inferred per chunk, a column that happens to be all-null (such as ``error`` in a chunk
+        without invalid rows) would be typed ``null`` and later chunks would not match it.
+        """
+        import pyarrow as pa
+
+        score_types = {
+            "prediction": pa.int8(),
+            "probability": pa.float32(),
+            "confidence": pa.string(),
+            "error": pa.string(),
+        }
+        inputs = pa.Schema.from_pandas(chunk.drop(columns=list(score_types)), preserve_index=False)
+        fields = [field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in inputs]
+        return pa.schema(fields + [pa.field(name, type_) for name, type_ in score_types.items()])
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def score_file(input_path: str, output_path: str, chunk_size: int = 50_000,
+               workers: Optional[int] = None) -> dict:
+    """Score ``input_path`` chunk by chunk across a process pool, returning throughput stats"""
+    from app.services.model_service import ModelService
+
+    workers = workers or os.cpu_count() or 1
+    # Load once in the parent so every worker scores with the same weights
+    service = ModelService()
+    service.load_artifacts()
+    engine = service.engine
+
+    started = time.perf_counter()
+    rows = 0
+    writer = ScoreWriter(output_path)
+    chunks = pd.read_csv(input_path, chunksize=chunk_size)
+    try:
+        if workers == 1:
+            for chunk in chunks:
+                scored = score_frame(chunk, service)
+                writer.write(scored)
+                rows += len(scored)
+        else:
+            # spawn avoids forking a process that may already hold TensorFlow threads
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(workers, initializer=_init_worker, initargs=(engine,)) as pool:
+                # At most 2 chunks per worker are parsed ahead of the writer, so memory stays
+                # bounded however large the file is (imap would queue the whole file at once);
+                # results are written in chunk order
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.apply_async(score_frame, (chunk,)))
+                    if len(pending) >= 2 * workers:
+                        scored = pending.popleft().get()
+                        writer.write(scored)
+                        rows += len(scored)
+                while pending:
+                    scored = pending.popleft().get()
+                    writer.write(scored)
+                    rows += len(scored)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed else 0.0,
+        "workers": workers,
+        "backend": service.backend,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a patient CSV with the diabetes model")
+    parser.add_argument("input", help="CSV in the API or diabetes_prediction_dataset.csv schema")
+    parser.add_argument("output", help="Output file (.csv or .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    stats = score_file(args.input, args.output, chunk_size=args.chunk_size, workers=args.workers)
+    print(
+        f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_second']:,.0f} rows/s, {stats['workers']} workers, {stats['backend']} backend)",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
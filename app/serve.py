@@ -0,0 +1,133 @@
+"""
+Production launcher: N uvicorn workers sharing one memory-mapped copy of the model
+
+Usage:
+    python -m app.serve --workers 4
+    python -m app.serve --workers 4 --host 0.0.0.0 --port 8000
+    python -m app.serve --workers 4 --grpc-port 50051
+
+The supervisor loads the model once, writes the compiled weights to a file that every
+worker maps read-only (so the weights live once in the page cache instead of once per
+process), binds the listening socket, and restarts workers that exit unexpectedly.
+With --grpc-port every worker also serves gRPC from its own ModelService; the workers
+share that port through SO_REUSEPORT.
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import time
+from typing import List, Optional
+
+import uvicorn
+
+from app.core.config import settings
+from app.services.numpy_engine import NumpyInferenceEngine
+
+# Minimum time between restarts of the same worker slot, so a crash loop cannot spin
+RESTART_BACKOFF_SECONDS = 1.0
+
+
+def _run_worker(config: uvicorn.Config, sockets):
+    """Entry point of one worker process"""
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+def export_shared_weights(directory: str) -> Optional[str]:
+    """Load the model in the supervisor and write its weights for the workers to map"""
+    from app.services.model_service import ModelService
+
+    service = ModelService()
+    service.load_artifacts()
+    if not isinstance(service.engine, NumpyInferenceEngine):
+        # Keras and ONNX Runtime keep their weights inside their own runtimes
+        print(f"Inference backend is {service.backend}; each worker will load its own model copy")
+        return None
+
+    path = os.path.join(directory, "weights.npy")
+    service.engine.save_mmap(path)
+    print(f"Shared weights written to {path} ({service.engine.describe()}, version {service.model_version})")
+    return path
+
+
+class Supervisor:
+    """Keeps ``workers`` uvicorn processes serving on one shared socket"""
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.context = multiprocessing.get_context("spawn")
+        self.processes: List[Optional[multiprocessing.Process]] = [None] * workers
+        self.started_at = [0.0] * workers
+        self.should_exit = False
+
+    def _start(self, slot: int, sockets):
+        process = self.context.Process(target=_run_worker, args=(self.config, sockets), daemon=False)
+        process.start()
+        self.processes[slot] = process
+        self.started_at[slot] = time.monotonic()
+        print(f"Started worker {slot} (pid {process.pid})")
+
+    def _handle_exit(self, signum, frame):
+        self.should_exit = True
+
+    def run(self):
+        sock = self.config.bind_socket()
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        try:
+            for slot in range(self.workers):
+                self._start(slot, [sock])
+
+            while not self.should_exit:
+                time.sleep(0.5)
+                for slot, process in enumerate(self.processes):
+                    if process.is_alive() or self.should_exit:
+                        continue
+                    print(f"Worker {slot} (pid {process.pid}) exited with code {process.exitcode}, restarting")
+                    uptime = time.monotonic() - self.started_at[slot]
+                    if uptime < RESTART_BACKOFF_SECONDS:
+                        time.sleep(RESTART_BACKOFF_SECONDS - uptime)
+                    self._start(slot, [sock])
+        finally:
+            print("Stopping workers...")
+            for process in self.processes:
+                if process is not None and process.is_alive():
+                    process.terminate()
+            for process in self.processes:
+                if process is not None:
+                    process.join(timeout=10)
+            sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the diabetes prediction API with multiple workers")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS or os.cpu_count() or 1,
+                        help="Worker processes (default: WORKERS setting, else CPU count)")
+    parser.add_argument("--grpc-port", type=int, default=settings.GRPC_PORT if settings.GRPC_ENABLED else None,
+                        help="Also serve gRPC on this port from every worker")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    weights_dir = tempfile.mkdtemp(prefix="diabetes-weights-")
+    try:
+        weights_path = export_shared_weights(weights_dir)
+        if weights_path is not None:
+            # Spawned workers read their settings from the environment
+            os.environ["SHARED_WEIGHTS_PATH"] = weights_path
+        if args.grpc_port is not None:
+            os.environ.update(GRPC_ENABLED="true", GRPC_HOST=args.host, GRPC_PORT=str(args.grpc_port))
+
+        config = uvicorn.Config("app.main:app", host=args.host, port=args.port, log_level=args.log_level)
+        print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers")
+        Supervisor(config, args.workers).run()
+    finally:
+        shutil.rmtree(weights_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
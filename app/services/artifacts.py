@@ -0,0 +1,97 @@
+"""
+Loading and caching of trained model artifacts
+"""
+import hashlib
+import os
+import pickle
+from typing import Tuple
+
+import numpy as np
+
+from app.models.schemas import CONTINUOUS_FEATURES, FEATURE_NAMES
+from app.services.numpy_engine import NumpyInferenceEngine
+
+
+def artifact_fingerprint(*paths: str) -> str:
+    """SHA-256 over the contents of the given files; missing files hash as empty"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode())
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def load_scaler(path: str):
+    """Unpickle a fitted StandardScaler (requires scikit-learn)"""
+    try:
+        import joblib
+        return joblib.load(path)
+    except ImportError:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+def scaler_feature_stats(scaler) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expand a fitted StandardScaler into per-feature mean and scale vectors
+    in FEATURE_NAMES order.
+
+    Features the scaler was not fitted on keep mean 0 and scale 1. Columns are
+    matched by ``feature_names_in_`` when the scaler was fitted on a DataFrame,
+    otherwise a scaler over all eight features or over the four continuous
+    features is accepted.
+    """
+    n_features = len(FEATURE_NAMES)
+    mean = np.zeros(n_features, dtype=np.float64)
+    scale = np.ones(n_features, dtype=np.float64)
+
+    names = getattr(scaler, "feature_names_in_", None)
+    if names is not None:
+        lookup = {name: i for i, name in enumerate(FEATURE_NAMES)}
+        try:
+            indices = [lookup[str(name).lower()] for name in names]
+        except KeyError as e:
+            raise ValueError(f"Scaler was fitted on unknown feature {e}")
+    elif scaler.n_features_in_ == n_features:
+        indices = list(range(n_features))
+    elif scaler.n_features_in_ == len(CONTINUOUS_FEATURES):
+        indices = [FEATURE_NAMES.index(name) for name in CONTINUOUS_FEATURES]
+    else:
+        raise ValueError(f"Scaler expects {scaler.n_features_in_} features, cannot map to {n_features}")
+
+    if getattr(scaler, "with_mean", True) and scaler.mean_ is not None:
+        mean[indices] = scaler.mean_
+    if getattr(scaler, "with_std", True) and scaler.scale_ is not None:
+        scale[indices] = scaler.scale_
+    return mean, scale
+
+
+def load_compiled_engine(path: str, fingerprint: str, engine_cls=NumpyInferenceEngine,
+                         required_metadata: Tuple[str, ...] = (), **load_options):
+    """Return the cached engine if it was compiled from artifacts matching ``fingerprint`` and has ``required_metadata``"""
+    if not os.path.exists(path):
+        return None
+    try:
+        engine, metadata = engine_cls.load(path, **load_options)
+    except Exception as e:
+        print(f"Ignoring unreadable compiled model {path}: {str(e)}")
+        return None
+    if metadata.get("fingerprint") != fingerprint:
+        return None
+    missing = [key for key in required_metadata if key not in metadata]
+    if missing:
+        print(f"Recompiling {path}: it has no {', '.join(missing)}")
+        return None
+    return engine
+
+
+def save_compiled_engine(engine, path: str, fingerprint: str, **metadata: str):
+    """Atomically write the compiled engine so concurrent workers never read a partial file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    engine.save(tmp_path, fingerprint=fingerprint, **metadata)
+    os.replace(tmp_path, path)
@@ -0,0 +1,246 @@
+"""
+Request and response bodies for the batch prediction endpoint
+
+Every format is decoded straight into a raw (N, 8) array that is range-checked column by
+column, so no per-patient pydantic models are built. JSON numbers are decoded as float64 and
+only narrowed to float32 once they pass, so values float32 would round into range (or to
+infinity) are still rejected. Besides JSON,
+``/predict/batch`` accepts:
+
+- Apache Arrow IPC (stream or file) with one numeric column per feature, or a single
+  ``features`` column of ``fixed_size_list<float32>[8]``
+- MessagePack: a map of feature name to array, a list of 8-value rows, or a map with a
+  ``features`` bin of packed float32 values
+- Packed little-endian float32, row-major N x 8, in FEATURE_NAMES order
+
+Responses use the request's format. A batch cut short by the time budget answers with the
+first rows only; JSON and MessagePack bodies say so in ``complete``, and every format carries
+``X-Patients-Processed`` and ``X-Patients-Total`` headers.
+"""
+import json
+from itertools import chain
+from operator import attrgetter, itemgetter
+from typing import List, Optional
+
+import numpy as np
+from pydantic_core import from_json
+
+from app.models.schemas import FEATURE_NAMES, BatchPredictionRequest
+from app.services.validation import feature_errors, invalid_rows
+
+BATCH_FORMATS = {
+    "application/json": "json",
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/vnd.apache.arrow.file": "arrow",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+    "application/octet-stream": "float32",
+}
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "msgpack": "application/msgpack",
+    "float32": "application/octet-stream",
+}
+
+N_FEATURES = len(FEATURE_NAMES)
+PACKED_DTYPE = np.dtype("<f4")
+
+
+class BatchFormatError(ValueError):
+    """The body could not be decoded in the declared format"""
+
+
+class BatchValidationError(ValueError):
+    """Some decoded values are missing or out of range; ``errors`` uses pydantic's error layout"""
+
+    def __init__(self, errors: List[dict]):
+        super().__init__(f"{len(errors)} invalid rows")
+        self.errors = errors
+
+
+def batch_format(content_type: Optional[str]) -> Optional[str]:
+    """Map a Content-Type value to a batch format name; no Content-Type means JSON"""
+    if not content_type:
+        return "json"
+    return BATCH_FORMATS.get(content_type.split(";")[0].strip().lower())
+
+
+def _packed_rows(data: bytes) -> np.ndarray:
+    """Zero-copy (N, 8) view of packed little-endian float32 values"""
+    if len(data) % (N_FEATURES * PACKED_DTYPE.itemsize):
+        raise BatchFormatError(f"Packed body must be a multiple of {N_FEATURES} float32 values")
+    return np.frombuffer(data, dtype=PACKED_DTYPE).reshape(-1, N_FEATURES)
+
+
+def _decode_json(body: bytes) -> np.ndarray:
+    """
+    Read ``{"patients": [...]}`` without building PredictionRequest models.
+
+    Bodies the fast path cannot read (malformed JSON, missing fields, nulls, non-numeric
+    values) are validated by BatchPredictionRequest instead, which raises pydantic's
+    ValidationError with the same errors as before.
+    """
+    get_features = itemgetter(*FEATURE_NAMES)
+    try:
+        patients = from_json(body)["patients"]
+        features = np.fromiter(
+            chain.from_iterable(map(get_features, patients)),
+            dtype=np.float64,
+            count=len(patients) * N_FEATURES
+        )
+    except (ValueError, TypeError, KeyError):
+        features = None
+    if features is None or np.isnan(features).any():
+        request = BatchPredictionRequest.model_validate_json(body)
+        get_attributes = attrgetter(*FEATURE_NAMES)
+        features = np.array([get_attributes(patient) for patient in request.patients], dtype=np.float64)
+    return features.reshape(-1, N_FEATURES)
+
+
+def _decode_arrow(body: bytes) -> np.ndarray:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise BatchFormatError("Arrow bodies require pyarrow on the server")
+
+    try:
+        try:
+            table = pa.ipc.open_stream(body).read_all()
+        except pa.ArrowInvalid:
+            table = pa.ipc.open_file(pa.BufferReader(body)).read_all()
+    except pa.ArrowInvalid as e:
+        raise BatchFormatError(f"Invalid Arrow IPC body: {str(e)}")
+
+    if "features" in table.column_names:
+        column = table.column("features").combine_chunks()
+        if not pa.types.is_fixed_size_list(column.type) or column.type.list_size != N_FEATURES:
+            raise BatchFormatError(f"'features' must be a fixed_size_list of {N_FEATURES} values")
+        values = column.flatten()
+        if values.type != pa.float32() or values.null_count:
+            values = values.cast(pa.float32())
+        # Single-chunk float32 without nulls is viewed in place
+        return values.to_numpy(zero_copy_only=False).reshape(-1, N_FEATURES)
+
+    missing = [name for name in FEATURE_NAMES if name not in table.column_names]
+    if missing:
+        raise BatchFormatError(f"Missing columns: {', '.join(missing)}")
+    features = np.empty((table.num_rows, N_FEATURES), dtype=np.float32)
+    for i, name in enumerate(FEATURE_NAMES):
+        try:
+            column = table.column(name).cast(pa.float32())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            raise BatchFormatError(f"Column '{name}' is not numeric")
+        # Nulls become NaN and are rejected by validation
+        features[:, i] = column.to_numpy()
+    return features
+
+
+def _decode_msgpack(body: bytes) -> np.ndarray:
+    try:
+        import msgpack
+    except ImportError:
+        raise BatchFormatError("MessagePack bodies require msgpack on the server")
+
+    try:
+        payload = msgpack.unpackb(body)
+    except (ValueError, msgpack.UnpackException) as e:
+        raise BatchFormatError(f"Invalid MessagePack body: {str(e)}")
+
+    if isinstance(payload, dict) and isinstance(payload.get("features"), bytes):
+        return _packed_rows(payload["features"])
+    if isinstance(payload, dict):
+        missing = [name for name in FEATURE_NAMES if name not in payload]
+        if missing:
+            raise BatchFormatError(f"Missing columns: {', '.join(missing)}")
+        try:
+            columns = [np.asarray(payload[name], dtype=np.float32) for name in FEATURE_NAMES]
+        except (TypeError, ValueError) as e:
+            raise BatchFormatError(f"MessagePack columns must be numeric arrays: {str(e)}")
+        if any(column.ndim != 1 or len(column) != len(columns[0]) for column in columns):
+            raise BatchFormatError("Columns must be flat arrays of equal length")
+        return np.stack(columns, axis=1)
+    if isinstance(payload, list):
+        if not payload:
+            return np.empty((0, N_FEATURES), dtype=np.float32)
+        try:
+            rows = np.asarray(payload, dtype=np.float32)
+        except (TypeError, ValueError) as e:
+            raise BatchFormatError(f"MessagePack rows must be numeric: {str(e)}")
+        if rows.ndim != 2 or rows.shape[1] != N_FEATURES:
+            raise BatchFormatError(f"Rows must have {N_FEATURES} values")
+        return rows
+    raise BatchFormatError("MessagePack body must be a map of columns or a list of rows")
+
+
+def decode_batch(body: bytes, body_format: str) -> np.ndarray:
+    """
+    Decode a body into a raw (N, 8) array, viewing the body where the layout allows.
+
+    Binary formats give float32; JSON gives float64, to be cast after validate_batch.
+    """
+    if body_format == "json":
+        return _decode_json(body)
+    if body_format == "float32":
+        return _packed_rows(body)
+    if body_format == "arrow":
+        return _decode_arrow(body)
+    if body_format == "msgpack":
+        return _decode_msgpack(body)
+    raise BatchFormatError(f"Unsupported batch format: {body_format}")
+
+
+def validate_batch(features: np.ndarray, body_format: str):
+    """Range-check whole columns at once, raising with one error per invalid value"""
+    # JSON errors point into the request model's "patients" list, binary ones at the row
+    loc = ("body", "patients") if body_format == "json" else ("body",)
+    if invalid_rows(features).any():
+        raise BatchValidationError(feature_errors(features, loc))
+
+
+def encode_results(body_format: str, predictions: np.ndarray, probabilities: np.ndarray,
+                   confidences: np.ndarray, complete: bool = True) -> bytes:
+    """Serialize predictions in the request's format; ``complete`` is False for a partial batch"""
+    if body_format == "json":
+        # Same compact layout as BatchPredictionResponse.model_dump_json()
+        return json.dumps({
+            "predictions": [
+                {"prediction": pred, "probability": proba, "confidence": conf}
+                for pred, proba, conf in zip(predictions.tolist(), probabilities.tolist(), confidences.tolist())
+            ],
+            "total_patients": len(predictions),
+            "complete": complete,
+        }, separators=(",", ":")).encode()
+
+    if body_format == "float32":
+        # N x 3 rows of prediction, probability and confidence code (0=High, 1=Medium, 2=Low)
+        codes = (confidences == "Medium") + 2 * (confidences == "Low")
+        return np.column_stack([predictions, probabilities, codes]).astype(PACKED_DTYPE).tobytes()
+
+    if body_format == "arrow":
+        import pyarrow as pa
+
+        table = pa.table({
+            "prediction": pa.array(predictions, type=pa.int8()),
+            "probability": pa.array(probabilities, type=pa.float32()),
+            "confidence": pa.array(confidences.tolist(), type=pa.string()),
+        })
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    if body_format == "msgpack":
+        import msgpack
+
+        return msgpack.packb({
+            "prediction": predictions.tolist(),
+            "probability": probabilities.tolist(),
+            "confidence": confidences.tolist(),
+            "total_patients": len(predictions),
+            "complete": complete,
+        })
+
+    raise BatchFormatError(f"Unsupported batch format: {body_format}")
@@ -0,0 +1,153 @@
+"""
+Dynamic micro-batching of concurrent single-patient predictions
+"""
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from app.core.metrics import Histogram
+from app.models.schemas import PredictionRequest, PredictionResponse
+from app.services.executor import InferenceQueueFullError
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into one vectorized forward pass.
+
+    At most ``max_concurrency`` batches are in flight; while they run, new
+    requests accumulate in the queue so batches grow with load. Requests
+    beyond ``max_queue`` are rejected with InferenceQueueFullError.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[PredictionRequest]], Awaitable[List[PredictionResponse]]],
+        max_batch_size: int = 32,
+        max_wait_us: int = 1000,
+        max_concurrency: int = 1,
+        max_queue: Optional[int] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1_000_000
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.batch_size_histogram = Histogram()
+        self.queue_depth_histogram = Histogram()
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self):
+        """Start the background batching task on the running event loop"""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching task and fail any requests still waiting"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped"))
+
+    async def submit(self, request: PredictionRequest) -> PredictionResponse:
+        """Queue one request and wait for its slot in the next batch"""
+        if not self.is_running:
+            raise RuntimeError("Prediction batcher is not running")
+        if self.max_queue is not None and self._queue.qsize() >= self.max_queue:
+            raise InferenceQueueFullError(
+                f"Prediction queue is full ({self._queue.qsize()} requests waiting)"
+            )
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((request, future))
+        return await future
+
+    async def _collect(self, batch: List[Tuple[PredictionRequest, asyncio.Future]]):
+        """Wait for the first request, then gather more until full or the wait expires"""
+        batch.append(await self._queue.get())
+        self.queue_depth_histogram.observe(self._queue.qsize() + 1)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self):
+        while True:
+            await self._slots.acquire()
+            batch = []
+            try:
+                await self._collect(batch)
+            except BaseException:
+                self._slots.release()
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Prediction batcher stopped"))
+                raise
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[PredictionRequest, asyncio.Future]]):
+        try:
+            # Callers that gave up while queued do not need a forward pass
+            batch = [(request, future) for request, future in batch if not future.done()]
+            if not batch:
+                return
+            self.batch_size_histogram.observe(len(batch))
+
+            try:
+                responses = await self.predict_batch([request for request, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+        finally:
+            self._slots.release()
+
+    def get_stats(self) -> dict:
+        """Batch size and queue depth distributions for tuning"""
+        return {
+            "enabled": self.is_running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_us": int(self.max_wait * 1_000_000),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": len(self._in_flight),
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "queue_depth": self.queue_depth_histogram.snapshot(),
+        }
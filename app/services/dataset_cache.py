@@ -0,0 +1,91 @@
+"""
+Preprocessed copy of the labelled dataset, memory-mapped instead of reparsed
+
+The encoded (N, 8) float32 features and int8 labels are written once as ``.npy`` files
+next to a ``meta.json`` with the continuous features' statistics. The cache directory is
+named after a hash of the raw CSV's contents and of the encoding, so editing either
+builds a new cache instead of reading a stale one. Loading maps the arrays read-only.
+"""
+import hashlib
+import json
+import os
+import shutil
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.models.schemas import CONTINUOUS_FEATURES, FEATURE_NAMES
+from app.services.encoding import DATASET_COLUMN_ALIASES, SMOKING_HISTORY_IS_SMOKER
+
+# Bump when encode_frame or row filtering changes meaning without changing the constants below
+ENCODING_VERSION = 1
+
+
+def dataset_key(path: str) -> str:
+    """Hash of the raw file and of every input to its encoding"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(json.dumps({
+        "version": ENCODING_VERSION,
+        "features": FEATURE_NAMES,
+        "smoking_history": SMOKING_HISTORY_IS_SMOKER,
+        "aliases": DATASET_COLUMN_ALIASES,
+    }, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_path(path: str, cache_dir: str) -> str:
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{name}-{dataset_key(path)}")
+
+
+def feature_stats(features: np.ndarray) -> dict:
+    """Mean and standard deviation of each continuous feature, in the Streamlit app's layout"""
+    stats = {}
+    for name in CONTINUOUS_FEATURES:
+        column = features[:, FEATURE_NAMES.index(name)].astype(np.float64)
+        stats[name] = {"mean": float(column.mean()), "std": float(column.std())}
+    return stats
+
+
+def write_dataset_cache(directory: str, features: np.ndarray, labels: np.ndarray, source: str, dropped: int = 0):
+    """Write the arrays to a temporary directory and rename it into place, so readers never see a partial cache"""
+    parent = os.path.dirname(directory)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    tmp_directory = f"{directory}.{os.getpid()}.tmp"
+    os.makedirs(tmp_directory, exist_ok=True)
+    np.save(os.path.join(tmp_directory, "features.npy"), np.ascontiguousarray(features, dtype=np.float32))
+    np.save(os.path.join(tmp_directory, "labels.npy"), np.ascontiguousarray(labels, dtype=np.int8))
+    with open(os.path.join(tmp_directory, "meta.json"), "w") as f:
+        json.dump({
+            "source": source,
+            "rows": int(len(labels)),
+            "dropped_rows": int(dropped),
+            "features": list(FEATURE_NAMES),
+            "stats": feature_stats(features),
+        }, f, indent=2)
+    try:
+        os.rename(tmp_directory, directory)
+    except OSError:
+        # Another process published the same cache first
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+
+
+def read_dataset_cache(directory: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Read-only memory maps of the cached features and labels, or None if there is no cache"""
+    try:
+        features = np.load(os.path.join(directory, "features.npy"), mmap_mode="r")
+        labels = np.load(os.path.join(directory, "labels.npy"), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if features.shape != (len(labels), len(FEATURE_NAMES)):
+        return None
+    return features, labels
+
+
+def read_dataset_stats(directory: str) -> dict:
+    with open(os.path.join(directory, "meta.json")) as f:
+        return json.load(f)["stats"]
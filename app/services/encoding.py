@@ -0,0 +1,58 @@
+"""
+Feature encoding for tabular patient data
+"""
+import numpy as np
+
+from app.models.schemas import FEATURE_NAMES
+
+# Same mapping as the notebooks: only current/former/ever smokers count as smokers
+SMOKING_HISTORY_IS_SMOKER = {
+    "never": 0,
+    "No Info": 0,
+    "current": 1,
+    "former": 1,
+    "ever": 1,
+    "not current": 0,
+}
+
+# Raw dataset column names that differ from the API field names
+DATASET_COLUMN_ALIASES = {"HbA1c_level": "hba1c_level"}
+
+
+def encode_frame(df: "pd.DataFrame") -> np.ndarray:
+    """
+    Encode a patient table into a raw (N, 8) float32 array in FEATURE_NAMES order.
+
+    Accepts either the API schema (binary ``gender`` and ``is_smoker``) or the
+    ``diabetes_prediction_dataset.csv`` schema (``Male``/``Female`` gender,
+    ``smoking_history`` categories, ``HbA1c_level``). Values that cannot be
+    parsed become NaN so callers can reject those rows individually.
+    """
+    import pandas as pd
+
+    df = df.rename(columns=DATASET_COLUMN_ALIASES)
+    columns = {}
+
+    gender = df.get("gender")
+    if gender is not None and not pd.api.types.is_numeric_dtype(gender):
+        # Same as the notebooks' is_male: anything other than "male" (e.g. "Other") is 0
+        gender = gender.str.strip().str.lower().eq("male").astype(np.float32).where(gender.notna())
+    columns["gender"] = gender
+
+    is_smoker = df.get("is_smoker")
+    if is_smoker is None and "smoking_history" in df:
+        is_smoker = df["smoking_history"].map(SMOKING_HISTORY_IS_SMOKER)
+    columns["is_smoker"] = is_smoker
+
+    missing = [
+        name for name in FEATURE_NAMES
+        if (columns[name] if name in columns else df.get(name)) is None
+    ]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    features = np.empty((len(df), len(FEATURE_NAMES)), dtype=np.float32)
+    for i, name in enumerate(FEATURE_NAMES):
+        column = columns[name] if name in columns else df[name]
+        features[:, i] = pd.to_numeric(column, errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+    return features
@@ -0,0 +1,89 @@
+"""
+Held-out evaluation of the diabetes model on the raw dataset
+"""
+import math
+from typing import Tuple
+
+import numpy as np
+
+TARGET_COLUMN = "diabetes"
+
+
+def holdout_indices(n_samples: int, test_fraction: float = 0.2, seed: int = 42) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Train and test row indices, identical to the notebooks'
+    ``train_test_split(test_size=0.2, random_state=42)`` (sklearn's ShuffleSplit recipe).
+    """
+    n_test = math.ceil(test_fraction * n_samples)
+    permutation = np.random.RandomState(seed).permutation(n_samples)
+    return permutation[n_test:], permutation[:n_test]
+
+
+def load_labeled_dataset(path: str, cache_dir: str = "") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode ``diabetes_prediction_dataset.csv`` into raw features and labels, dropping invalid rows.
+
+    With ``cache_dir`` the encoded arrays are memory-mapped from a preprocessed cache,
+    which is built on first use (see app.services.dataset_cache).
+    """
+    from app.services.dataset_cache import cache_path, read_dataset_cache, write_dataset_cache
+    from app.services.encoding import encode_frame
+    from app.services.validation import invalid_rows
+
+    if cache_dir:
+        directory = cache_path(path, cache_dir)
+        cached = read_dataset_cache(directory)
+        if cached is not None:
+            return cached
+
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    if TARGET_COLUMN not in df:
+        raise ValueError(f"{path} has no '{TARGET_COLUMN}' column")
+    features = encode_frame(df)
+    labels = df[TARGET_COLUMN].to_numpy(dtype=np.int8)
+    valid = ~invalid_rows(features)
+    if cache_dir:
+        try:
+            write_dataset_cache(directory, features[valid], labels[valid], path, dropped=int((~valid).sum()))
+        except OSError as e:
+            print(f"Could not cache the preprocessed dataset: {str(e)}")
+    return features[valid], labels[valid]
+
+
+def recall(labels: np.ndarray, predictions: np.ndarray) -> float:
+    """Share of positive rows predicted positive"""
+    positives = labels == 1
+    return float(predictions[positives].mean()) if positives.any() else 0.0
+
+
+def roc_auc(labels: np.ndarray, scores: np.ndarray) -> float:
+    """Area under the ROC curve via the Mann-Whitney U statistic (ties count half)"""
+    positives = labels == 1
+    n_positive = int(positives.sum())
+    n_negative = len(labels) - n_positive
+    if n_positive == 0 or n_negative == 0:
+        return float("nan")
+    order = np.argsort(scores, kind="mergesort")
+    sorted_scores = scores[order]
+    ranks = np.empty(len(scores), dtype=np.float64)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    # Average the ranks of tied scores
+    _, first, counts = np.unique(sorted_scores, return_index=True, return_counts=True)
+    tied = counts > 1
+    for start, count in zip(first[tied], counts[tied]):
+        ranks[order[start:start + count]] = start + (count + 1) / 2
+    u_statistic = ranks[positives].sum() - n_positive * (n_positive + 1) / 2
+    return float(u_statistic / (n_positive * n_negative))
+
+
+def evaluate(engine, features: np.ndarray, labels: np.ndarray, threshold: float = 0.5) -> dict:
+    """Recall and AUC of ``engine`` on raw features, at the API's decision threshold"""
+    scores = engine.predict(features).reshape(-1)
+    predictions = (scores > threshold).astype(np.int8)
+    return {
+        "rows": int(len(labels)),
+        "recall": recall(labels, predictions),
+        "auc": roc_auc(labels, scores),
+    }
@@ -0,0 +1,61 @@
+"""
+Bounded executor for CPU-bound inference
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+class InferenceQueueFullError(Exception):
+    """Raised when the inference executor cannot accept more work"""
+
+
+class InferenceExecutor:
+    """Thread pool that keeps inference off the event loop and rejects work beyond its queue"""
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 256):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._capacity = max_workers + max_queue
+        self._pending = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable, *args):
+        """Run ``fn(*args)`` on the pool, raising InferenceQueueFullError when saturated"""
+        with self._lock:
+            if self._pending >= self._capacity:
+                self._rejected += 1
+                raise InferenceQueueFullError(
+                    f"Inference queue is full ({self._pending} tasks pending)"
+                )
+            self._pending += 1
+
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        # Released when the work finishes, even if the awaiting caller is cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "rejected": self._rejected,
+            }
@@ -2,11 +2,77 @@
 Model service for diabetes prediction
 """
 import numpy as np
-import tensorflow as tf
-import pickle
+import hashlib
 import os
-from typing import List, Tuple
-from app.models.schemas import PredictionRequest, PredictionResponse
+import time
+from itertools import chain
+from operator import attrgetter
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import (
+    INFERENCE_BATCH_SIZE,
+    MODEL_LOAD_SECONDS,
+    PREDICTIONS,
+    registry,
+    track_stage
+)
+from app.models.schemas import FEATURE_NAMES, PredictionRequest, PredictionResponse
+from app.services.artifacts import (
+    artifact_fingerprint,
+    load_compiled_engine,
+    load_scaler,
+    save_compiled_engine,
+    scaler_feature_stats
+)
+from app.services.batcher import MicroBatcher
+from app.services.executor import InferenceExecutor
+from app.services.numpy_engine import NumpyInferenceEngine
+from app.services.onnx_engine import OnnxInferenceEngine
+from app.services.quantization import QuantizedInferenceEngine
+from app.services.prediction_cache import PredictionCache
+
+# Placeholder standardization stats for age, bmi, hba1c_level and blood_glucose_level
+# (same values as the Streamlit app); binary features keep mean 0 and scale 1
+DEFAULT_FEATURE_MEAN = np.array([0, 42.0, 0, 0, 27.0, 5.5, 140.0, 0], dtype=np.float32)
+DEFAULT_FEATURE_SCALE = np.array([1, 22.5, 1, 1, 6.5, 1.2, 40.0, 1], dtype=np.float32)
+
+CONFIDENCE_LEVELS = np.array(["High", "Medium", "Low"])
+
+# Compiled-engine metadata recording the one-time check against Keras
+PARITY_METADATA = ("keras_parity_error",)
+
+def standardization_stats(scaler=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Float32 mean and scale the service standardizes with: the fitted scaler's, or the defaults without one"""
+    if scaler is None:
+        return DEFAULT_FEATURE_MEAN, DEFAULT_FEATURE_SCALE
+    mean, scale = scaler_feature_stats(scaler)
+    return mean.astype(np.float32), scale.astype(np.float32)
+
+# Architecture from deeper_model.ipynb (best performing): (units, activation) per Dense layer
+PLACEHOLDER_LAYERS = [(10, "relu"), (64, "relu"), (32, "relu"), (16, "relu"), (1, "sigmoid")]
+
+_tensorflow = None
+
+def _import_tensorflow():
+    """
+    Import TensorFlow on first use and cap its thread pools before its runtime starts.
+    
+    Only the Keras backend and compiling a trained model need TensorFlow; serving a
+    compiled or shared NumPy engine never imports it.
+    """
+    global _tensorflow
+    if _tensorflow is None:
+        import tensorflow as tf
+        try:
+            if settings.TF_INTRA_OP_THREADS:
+                tf.config.threading.set_intra_op_parallelism_threads(settings.TF_INTRA_OP_THREADS)
+            if settings.TF_INTER_OP_THREADS:
+                tf.config.threading.set_inter_op_parallelism_threads(settings.TF_INTER_OP_THREADS)
+        except RuntimeError as e:
+            # TensorFlow refuses once its runtime has been initialized
+            print(f"Could not configure TensorFlow threads: {str(e)}")
+        _tensorflow = tf
+    return _tensorflow
 
 class ModelService:
     """Service class for diabetes prediction model"""
@@ -14,21 +80,66 @@ class ModelService:
     def __init__(self):
         self.model = None
         self.scaler = None
+        self.feature_mean = DEFAULT_FEATURE_MEAN
+        self.feature_scale = DEFAULT_FEATURE_SCALE
+        self.engine = None
+        self.backend = "keras"
+        # Max difference from Keras measured when the engine was compiled
+        self.parity_error = None
+        self.batcher = None
+        self.executor = None
+        self.cache = None
+        self.model_version = None
+        # False while serving the randomly initialized placeholder (no model at MODEL_PATH)
+        self.trained = False
+        # Recent forward-pass seconds per row, used to fit chunks into a deadline
+        self.row_seconds = None
         self.is_loaded = False
     
     async def load_model(self):
-        """Load the trained model and scaler"""
+        """Load the trained model and scaler and start the serving machinery"""
+        self.load_artifacts()
+        
+        if settings.PREDICTION_CACHE_SIZE > 0:
+            self.cache = PredictionCache(
+                max_size=settings.PREDICTION_CACHE_SIZE,
+                ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS,
+                decimals=settings.PREDICTION_CACHE_DECIMALS
+            )
+            self.cache.set_version(self.model_version)
+        
+        self.executor = InferenceExecutor(
+            max_workers=settings.INFERENCE_WORKERS,
+            max_queue=settings.INFERENCE_MAX_QUEUE
+        )
+        if settings.MICRO_BATCHING_ENABLED:
+            self.batcher = MicroBatcher(
+                self.predict_batch_async,
+                max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+                max_wait_us=settings.MICRO_BATCH_MAX_WAIT_US,
+                max_concurrency=settings.INFERENCE_WORKERS,
+                max_queue=settings.INFERENCE_MAX_QUEUE
+            )
+            await self.batcher.start()
+            registry.register(
+                "diabetes_batcher_batch_size",
+                "Requests coalesced per micro-batch",
+                self.batcher.batch_size_histogram
+            )
+            registry.register(
+                "diabetes_batcher_queue_depth",
+                "Micro-batch queue depth when a batch starts collecting",
+                self.batcher.queue_depth_histogram
+            )
+    
+    def load_artifacts(self):
+        """Load the trained model and scaler for synchronous use (no executor or batcher)"""
+        started = time.perf_counter()
         try:
-            # For now, we'll create a placeholder model since we need to save the actual model
-            # In production, you would load the actual saved model
-            print("Creating model architecture...")
-            self.model = self._create_model_architecture()
-            
-            # Load scaler (you'll need to save this from your training)
-            print("Loading scaler...")
-            self.scaler = self._create_scaler()
-            
+            if not (self._load_shared_weights() or self._load_quantized_model() or self._load_compiled_model()):
+                self._load_model_artifacts()
             self.is_loaded = True
+            self.trained = os.path.exists(settings.MODEL_PATH)
             print("Model and scaler loaded successfully!")
             
         except Exception as e:
@@ -36,12 +147,232 @@ class ModelService:
             # Create a simple fallback model for testing
             print("Creating fallback model...")
             self.model = self._create_fallback_model()
-            self.scaler = self._create_scaler()
+            self.engine = None
+            self.backend = "keras"
             self.is_loaded = True
+            self.trained = False
             print("Fallback model loaded successfully!")
+        self.model_version = self._compute_model_version()
+        if self.cache is not None:
+            self.cache.set_version(self.model_version)
+        MODEL_LOAD_SECONDS.set(time.perf_counter() - started)
+    
+    def use_engine(self, engine):
+        """Serve a prebuilt NumPy or ONNX engine that already has the scaler folded in"""
+        self.model = None
+        self.engine = engine
+        self.backend = engine.backend
+        self.model_version = self._compute_model_version()
+        self.is_loaded = True
+        self.trained = os.path.exists(settings.MODEL_PATH)
+    
+    def _compute_model_version(self) -> str:
+        """Identifier that changes whenever the served weights or scaling change"""
+        if self.engine is not None:
+            return self.engine.fingerprint()[:16]
+        if self.model is not None and hasattr(self.model, "get_weights"):
+            digest = hashlib.sha256()
+            for weights in self.model.get_weights():
+                digest.update(np.ascontiguousarray(weights).tobytes())
+            digest.update(self.feature_mean.tobytes())
+            digest.update(self.feature_scale.tobytes())
+            return digest.hexdigest()[:16]
+        # The random fallback model has no stable identity
+        return "fallback"
+    
+    async def shutdown(self):
+        """Release background resources"""
+        if self.batcher is not None:
+            await self.batcher.stop()
+            self.batcher = None
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+    
+    def _load_shared_weights(self) -> bool:
+        """Map the weights the serving supervisor already loaded, when running under app.serve"""
+        if not settings.SHARED_WEIGHTS_PATH:
+            return False
+        
+        self.engine = NumpyInferenceEngine.load_mmap(settings.SHARED_WEIGHTS_PATH)
+        self.backend = "numpy"
+        print(f"Mapped shared weights {settings.SHARED_WEIGHTS_PATH} ({self.engine.describe()})")
+        return True
+    
+    def _load_quantized_model(self) -> bool:
+        """Serve the quantized model published by app.quantize for the current artifacts"""
+        precision = settings.QUANTIZATION
+        if not precision:
+            return False
+        if settings.INFERENCE_BACKEND != "numpy":
+            print(f"QUANTIZATION={precision} needs INFERENCE_BACKEND=numpy, serving full precision")
+            return False
+        
+        path = settings.QUANTIZED_MODEL_PATH.format(precision=precision)
+        fingerprint = artifact_fingerprint(settings.MODEL_PATH, settings.SCALER_PATH)
+        engine = load_compiled_engine(path, fingerprint, QuantizedInferenceEngine)
+        if engine is None or engine.precision != precision:
+            print(f"No published {precision} model at {path} for the current artifacts, serving full precision")
+            return False
+        
+        self.engine = engine
+        self.backend = f"numpy-{precision}"
+        print(f"Loaded quantized model {path} ({engine.describe()})")
+        return True
+    
+    def _compiled_model_path(self, backend: str) -> str:
+        """Where the compiled engine for ``backend`` is cached"""
+        return settings.ONNX_MODEL_PATH if backend == "onnx" else settings.COMPILED_MODEL_PATH
+    
+    def _load_compiled_model(self) -> bool:
+        """Use the cached NumPy or ONNX engine when it was compiled from the current artifacts"""
+        backend = settings.INFERENCE_BACKEND
+        if backend not in ("numpy", "onnx") or not os.path.exists(settings.MODEL_PATH):
+            return False
+        
+        path = self._compiled_model_path(backend)
+        fingerprint = artifact_fingerprint(settings.MODEL_PATH, settings.SCALER_PATH)
+        # Only engines whose Keras parity check was recorded when they were compiled
+        if backend == "onnx":
+            engine = load_compiled_engine(path, fingerprint, OnnxInferenceEngine, required_metadata=PARITY_METADATA,
+                                          intra_op_threads=settings.ONNX_INTRA_OP_THREADS)
+        else:
+            engine = load_compiled_engine(path, fingerprint, required_metadata=PARITY_METADATA)
+        if engine is None:
+            return False
+        
+        self.engine = engine
+        self.backend = backend
+        print(f"Loaded compiled model {path} ({engine.describe()})")
+        return True
+    
+    def _load_model_artifacts(self):
+        """Load the Keras model and fitted scaler, then compile the NumPy or ONNX engine"""
+        has_trained_model = os.path.exists(settings.MODEL_PATH)
+        if not has_trained_model and settings.INFERENCE_BACKEND in ("numpy", "onnx"):
+            # Placeholder weights are random anyway, so build them without TensorFlow
+            print(f"No model at {settings.MODEL_PATH}, creating NumPy model architecture...")
+            self._load_feature_stats()
+            engine = self._create_numpy_architecture()
+            self.model = None
+            self.engine = engine.with_input_scaling(self.feature_mean, self.feature_scale)
+            self.backend = "numpy"
+            if settings.INFERENCE_BACKEND == "onnx":
+                self._select_onnx(engine, reference=engine)
+            return
+        
+        if has_trained_model:
+            print(f"Loading model from {settings.MODEL_PATH}...")
+            tf = _import_tensorflow()
+            self.model = tf.keras.models.load_model(settings.MODEL_PATH, compile=False)
+        else:
+            print(f"No model at {settings.MODEL_PATH}, creating model architecture...")
+            self.model = self._create_model_architecture()
+        
+        n_inputs = self.model.input_shape[-1]
+        if n_inputs != len(FEATURE_NAMES):
+            raise ValueError(f"Model expects {n_inputs} features, API provides {len(FEATURE_NAMES)}")
+        
+        self._load_feature_stats()
+        # Placeholder weights are random on every start, so only trained models are cached
+        fingerprint = artifact_fingerprint(settings.MODEL_PATH, settings.SCALER_PATH) if has_trained_model else ""
+        self._select_backend(fingerprint)
+        if self.engine is not None and has_trained_model:
+            path = self._compiled_model_path(self.backend)
+            try:
+                # Warm starts trust the recorded check instead of loading Keras again
+                save_compiled_engine(self.engine, path, fingerprint, keras_parity_error=f"{self.parity_error:.3e}")
+                print(f"Compiled model cached at {path}")
+            except OSError as e:
+                print(f"Could not cache compiled model: {str(e)}")
+    
+    def _load_feature_stats(self):
+        """Take standardization statistics from the fitted scaler, if there is one"""
+        print("Loading scaler...")
+        self.scaler = self._load_scaler()
+        self.feature_mean, self.feature_scale = standardization_stats(self.scaler)
+    
+    def _select_backend(self, fingerprint: str = ""):
+        """Switch to the NumPy (or ONNX Runtime) engine when configured and it matches Keras"""
+        self.engine = None
+        self.backend = "keras"
+        if settings.INFERENCE_BACKEND not in ("numpy", "onnx"):
+            return
+        
+        try:
+            engine = self._numpy_engine()
+            error = engine.parity_error(self.model)
+        except Exception as e:
+            print(f"NumPy engine unavailable, using Keras: {str(e)}")
+            return
+        
+        if error > settings.PARITY_TOLERANCE:
+            print(f"NumPy engine parity check failed (max error {error:.2e}), using Keras")
+            return
+        
+        # The engine takes raw features: standardization lives in its first layer
+        self.engine = engine.with_input_scaling(self.feature_mean, self.feature_scale)
+        self.backend = "numpy"
+        self.parity_error = error
+        print(f"Using NumPy inference engine {engine.describe()} (max parity error {error:.2e})")
+        
+        if settings.INFERENCE_BACKEND == "onnx":
+            self._select_onnx(engine, reference=self.model, fingerprint=fingerprint)
+    
+    def _select_onnx(self, engine: NumpyInferenceEngine, reference, fingerprint: str = ""):
+        """Export ``engine`` to ONNX and serve it with ONNX Runtime if it matches ``reference``"""
+        try:
+            error = OnnxInferenceEngine.from_engine(engine).parity_error(reference)
+        except Exception as e:
+            print(f"ONNX Runtime unavailable, using NumPy: {str(e)}")
+            return
+        
+        if error > settings.PARITY_TOLERANCE:
+            print(f"ONNX parity check failed (max error {error:.2e}), using NumPy")
+            return
+        
+        metadata = {"fingerprint": fingerprint} if fingerprint else {}
+        self.engine = OnnxInferenceEngine.from_engine(
+            engine.with_input_scaling(self.feature_mean, self.feature_scale),
+            intra_op_threads=settings.ONNX_INTRA_OP_THREADS,
+            **metadata
+        )
+        self.backend = "onnx"
+        self.parity_error = error
+        print(f"Using {self.engine.describe()} (max parity error {error:.2e})")
+    
+    def _numpy_engine(self) -> NumpyInferenceEngine:
+        """The float32 engine, read straight from the trained ``.h5`` file when there is one"""
+        if os.path.exists(settings.MODEL_PATH):
+            try:
+                return NumpyInferenceEngine.from_h5(settings.MODEL_PATH)
+            except Exception as e:
+                print(f"Could not read {settings.MODEL_PATH} directly, taking the weights from Keras: {str(e)}")
+        return NumpyInferenceEngine.from_keras_model(self.model)
+    
+    def _forward(self, input_data: np.ndarray) -> np.ndarray:
+        """Run the forward pass on raw features, returning an (N, 1) array"""
+        if self.engine is not None:
+            return self.engine.predict(input_data)
+        
+        # Standardize continuous features in one broadcast; binary features pass through
+        scaled = (input_data - self.feature_mean) / self.feature_scale
+        return self.model.predict(scaled, verbose=0)
+    
+    def _create_numpy_architecture(self, seed=None) -> NumpyInferenceEngine:
+        """Placeholder architecture as a NumPy engine, Glorot-uniform initialized like Keras"""
+        rng = np.random.default_rng(seed)
+        layers = []
+        fan_in = len(FEATURE_NAMES)
+        for units, activation in PLACEHOLDER_LAYERS:
+            limit = np.sqrt(6.0 / (fan_in + units))
+            layers.append((rng.uniform(-limit, limit, (fan_in, units)), np.zeros(units), activation))
+            fan_in = units
+        return NumpyInferenceEngine(layers)
     
     def _create_model_architecture(self):
         """Create the model architecture based on the best performing model"""
+        _import_tensorflow()
         try:
             from tensorflow.keras.models import Sequential
             from tensorflow.keras.layers import Dense
@@ -51,13 +382,11 @@ class ModelService:
             from keras.layers import Dense
         
         # Architecture from deeper_model.ipynb (best performing)
-        model = Sequential([
-            Dense(10, activation='relu', input_shape=(8,)),
-            Dense(64, activation='relu'),
-            Dense(32, activation='relu'),
-            Dense(16, activation='relu'),
-            Dense(1, activation='sigmoid')
-        ])
+        (units, activation), *hidden = PLACEHOLDER_LAYERS
+        model = Sequential(
+            [Dense(units, activation=activation, input_shape=(len(FEATURE_NAMES),))]
+            + [Dense(units, activation=activation) for units, activation in hidden]
+        )
         
         # Compile with the same configuration
         model.compile(
@@ -79,89 +408,178 @@ class ModelService:
         
         return MockModel()
     
-    def _create_scaler(self):
-        """Create a scaler (placeholder - in production, load from saved file)"""
-        from sklearn.preprocessing import StandardScaler
-        scaler = StandardScaler()
-        # In production, you would load the fitted scaler
-        return scaler
+    def _load_scaler(self):
+        """Load the fitted scaler from SCALER_PATH, if present"""
+        if not os.path.exists(settings.SCALER_PATH):
+            print(f"No scaler at {settings.SCALER_PATH}, using default feature statistics")
+            return None
+        return load_scaler(settings.SCALER_PATH)
+    
+    def _cached_response(self, key) -> Optional[PredictionResponse]:
+        """A copy of the cached response for ``key``, counted in PREDICTIONS like a computed one"""
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        PREDICTIONS.labels(cached.prediction, cached.confidence).inc()
+        return cached.model_copy()
     
     def predict(self, request: PredictionRequest) -> PredictionResponse:
         """Make a single prediction"""
+        key = self.cache.key_for(request) if self.cache is not None else None
+        if key is not None:
+            cached = self._cached_response(key)
+            if cached is not None:
+                return cached
+        
+        response = self.predict_batch([request])[0]
+        if key is not None:
+            # The caller gets its own instance, so mutating it cannot change later hits
+            self.cache.put(key, response.model_copy())
+        return response
+    
+    async def predict_async(self, request: PredictionRequest) -> PredictionResponse:
+        """Make a single prediction, coalesced with concurrent requests when batching is enabled"""
         if not self.is_loaded:
             raise ValueError("Model not loaded")
         
-        # Prepare input data
-        input_data = self._prepare_input_data(request)
-        
-        # Make prediction
-        prediction_proba = self.model.predict(input_data, verbose=0)[0][0]
-        prediction = 1 if prediction_proba > 0.5 else 0
-        
-        # Determine confidence level
-        confidence = self._get_confidence_level(prediction_proba)
+        # Cache hits are answered on the event loop without queueing
+        key = self.cache.key_for(request) if self.cache is not None else None
+        if key is not None:
+            cached = self._cached_response(key)
+            if cached is not None:
+                return cached
         
-        return PredictionResponse(
-            prediction=prediction,
-            probability=float(prediction_proba),
-            confidence=confidence
-        )
+        if self.batcher is not None:
+            response = await self.batcher.submit(request)
+        else:
+            response = await self.executor.run(self.predict_batch, [request])
+            response = response[0]
+        if key is not None:
+            # The caller gets its own instance, so mutating it cannot change later hits
+            self.cache.put(key, response.model_copy())
+        return response
     
-    def predict_batch(self, requests: List[PredictionRequest]) -> List[PredictionResponse]:
-        """Make batch predictions"""
+    async def predict_batch_async(self, requests: List[PredictionRequest]) -> List[PredictionResponse]:
+        """Make batch predictions on the inference executor"""
+        if not self.is_loaded:
+            raise ValueError("Model not loaded")
+        return await self.executor.run(self.predict_batch, requests)
+    
+    async def run_in_executor(self, fn, *args):
+        """Run CPU-bound work that calls into the model on the inference executor"""
+        if not self.is_loaded:
+            raise ValueError("Model not loaded")
+        return await self.executor.run(fn, *args)
+    
+    def predict_batch(self, requests: List[PredictionRequest],
+                      deadline: Optional[float] = None) -> List[PredictionResponse]:
+        """Make batch predictions, for fewer requests than given if ``deadline`` is reached"""
         if not self.is_loaded:
             raise ValueError("Model not loaded")
         
-        # Prepare batch input data
-        batch_data = np.array([self._prepare_input_data(req) for req in requests])
-        batch_data = batch_data.reshape(len(requests), -1)
-        
-        # Make batch predictions
-        predictions_proba = self.model.predict(batch_data, verbose=0)
-        predictions = (predictions_proba > 0.5).astype(int).flatten()
+        with track_stage("preparation"):
+            batch_data = self._prepare_batch_data(requests)
+        predictions, probabilities, confidences = self.predict_arrays(batch_data, deadline)
+        return self._build_responses(predictions, probabilities, confidences)
+    
+    def predict_arrays(self, batch_data: np.ndarray,
+                       deadline: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score a prepared (N, 8) array, returning predictions, probabilities and confidence levels.
         
-        # Create response objects
-        responses = []
-        for i, (pred, proba) in enumerate(zip(predictions, predictions_proba.flatten())):
-            confidence = self._get_confidence_level(proba)
-            responses.append(PredictionResponse(
-                prediction=int(pred),
-                probability=float(proba),
-                confidence=confidence
-            ))
+        Large arrays are scored in cache-sized chunks. With a ``deadline`` (a ``time.perf_counter()``
+        value) the last chunks shrink to what the measured throughput can finish in time and scoring
+        stops when nothing more fits, so only the first rows may be returned. The first chunk always
+        runs, so every call makes progress.
+        """
+        chunk_rows = self._chunk_rows()
+        probabilities = np.empty(len(batch_data), dtype=np.float32)
+        done = 0
+        while done < len(batch_data):
+            rows = min(chunk_rows, len(batch_data) - done)
+            if deadline is not None and done:
+                rows = min(rows, int((deadline - time.perf_counter()) / self.row_seconds))
+                if rows <= 0:
+                    break
+            started = time.perf_counter()
+            INFERENCE_BATCH_SIZE.observe(rows)
+            with track_stage("forward"):
+                probabilities[done:done + rows] = self._forward(batch_data[done:done + rows]).reshape(-1)
+            row_seconds = (time.perf_counter() - started) / rows
+            self.row_seconds = row_seconds if self.row_seconds is None else 0.8 * self.row_seconds + 0.2 * row_seconds
+            done += rows
         
-        return responses
+        probabilities = probabilities[:done]
+        predictions = (probabilities > 0.5).astype(np.int8)
+        bands = self._get_confidence_bands(probabilities)
+        self._record_predictions(predictions, bands)
+        return predictions, probabilities, CONFIDENCE_LEVELS[bands]
+    
+    def _chunk_rows(self) -> int:
+        """Rows per forward pass: BATCH_CHUNK_ROWS, or enough to fill BATCH_CHUNK_CACHE_BYTES"""
+        if settings.BATCH_CHUNK_ROWS > 0:
+            return settings.BATCH_CHUNK_ROWS
+        layers = getattr(self.engine, "layers", None)
+        if layers:
+            width = max(kernel.shape[1] for kernel, _, _ in layers)
+        else:
+            width = max(units for units, _ in PLACEHOLDER_LAYERS)
+        # float32 input and output activations of the widest layer
+        return max(1, settings.BATCH_CHUNK_CACHE_BYTES // (2 * 4 * width))
     
     def _prepare_input_data(self, request: PredictionRequest) -> np.ndarray:
         """Prepare input data for prediction"""
-        # Convert request to array in the correct order
-        input_data = np.array([[
-            request.gender,
-            request.age,
-            request.hypertension,
-            request.heart_disease,
-            request.bmi,
-            request.hba1c_level,
-            request.blood_glucose_level,
-            request.is_smoker
-        ]])
-        
-        # Apply scaling (in production, use the fitted scaler)
-        # For now, we'll apply basic normalization
-        continuous_features = [1, 4, 5, 6]  # age, bmi, hba1c_level, blood_glucose_level
-        for idx in continuous_features:
-            input_data[0, idx] = (input_data[0, idx] - np.mean([input_data[0, idx]])) / np.std([input_data[0, idx]])
-        
+        return self._prepare_batch_data([request])
+    
+    def _prepare_batch_data(self, requests: List[PredictionRequest]) -> np.ndarray:
+        """Convert requests to a raw (N, 8) float32 array in feature order"""
+        get_features = attrgetter(*FEATURE_NAMES)
+        input_data = np.fromiter(
+            chain.from_iterable(get_features(req) for req in requests),
+            dtype=np.float32,
+            count=len(requests) * len(FEATURE_NAMES)
+        ).reshape(len(requests), len(FEATURE_NAMES))
         return input_data
     
-    def _get_confidence_level(self, probability: float) -> str:
-        """Determine confidence level based on probability"""
-        if probability < 0.3 or probability > 0.7:
-            return "High"
-        elif probability < 0.4 or probability > 0.6:
-            return "Medium"
-        else:
-            return "Low"
+    def _get_confidence_bands(self, probabilities: np.ndarray) -> np.ndarray:
+        """Determine confidence levels as indices into CONFIDENCE_LEVELS"""
+        return np.select(
+            [
+                (probabilities < 0.3) | (probabilities > 0.7),
+                (probabilities < 0.4) | (probabilities > 0.6)
+            ],
+            [0, 1],
+            default=2
+        )
+    
+    def _record_predictions(self, predictions: np.ndarray, bands: np.ndarray):
+        """Count predictions per (class, confidence band) with one bincount"""
+        n_bands = len(CONFIDENCE_LEVELS)
+        counts = np.bincount(predictions * n_bands + bands, minlength=2 * n_bands)
+        for index in np.flatnonzero(counts):
+            prediction, band = divmod(int(index), n_bands)
+            PREDICTIONS.labels(prediction, CONFIDENCE_LEVELS[band]).inc(int(counts[index]))
+    
+    def _build_responses(self, predictions: np.ndarray, probabilities: np.ndarray,
+                         confidences: np.ndarray) -> List[PredictionResponse]:
+        """Materialize response objects from already-validated columns"""
+        return [
+            PredictionResponse.model_construct(prediction=pred, probability=proba, confidence=conf)
+            for pred, proba, conf in zip(predictions.tolist(), probabilities.tolist(), confidences.tolist())
+        ]
+    
+    def get_batching_stats(self) -> dict:
+        """Micro-batching queue depth and batch size histograms"""
+        stats = self.batcher.get_stats() if self.batcher is not None else {"enabled": False}
+        if self.executor is not None:
+            stats["executor"] = self.executor.get_stats()
+        return stats
+    
+    def get_cache_stats(self) -> dict:
+        """Prediction cache hit rate, evictions and size"""
+        if self.cache is None:
+            return {"enabled": False}
+        return self.cache.get_stats()
     
     def get_model_info(self) -> dict:
         """Get model information"""
@@ -173,5 +591,9 @@ class ModelService:
             "architecture": "5-layer neural network",
             "input_features": 8,
             "output_classes": 2,
-            "model_type": "binary_classification"
+            "model_type": "binary_classification",
+            "inference_backend": self.backend,
+            "model_version": self.model_version,
+            # Placeholder weights are random, so its predictions are meaningless
+            "trained": self.trained
         }
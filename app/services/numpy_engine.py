@@ -0,0 +1,285 @@
+"""
+Pure-NumPy inference engine for the diabetes prediction model
+"""
+import hashlib
+import json
+import numpy as np
+from typing import List, Optional, Tuple
+
+SUPPORTED_ACTIVATIONS = ("linear", "relu", "sigmoid", "tanh")
+
+
+def _apply_activation(x: np.ndarray, activation: str) -> np.ndarray:
+    """Apply an activation function in place"""
+    if activation == "relu":
+        np.maximum(x, 0.0, out=x)
+    elif activation == "sigmoid":
+        # tanh form of the logistic function never overflows in float32
+        np.multiply(x, 0.5, out=x)
+        np.tanh(x, out=x)
+        np.add(x, 1.0, out=x)
+        np.multiply(x, 0.5, out=x)
+    elif activation == "tanh":
+        np.tanh(x, out=x)
+    return x
+
+
+def _activation_name(activation) -> str:
+    """Normalize a Keras activation config entry to its name"""
+    if isinstance(activation, dict):
+        activation = activation.get("config", {}).get("name", activation.get("class_name"))
+    activation = (activation or "linear").lower()
+    if activation not in SUPPORTED_ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy engine: {activation}")
+    return activation
+
+
+class NumpyInferenceEngine:
+    """Evaluates a Dense/BatchNormalization stack as float32 NumPy matmuls"""
+
+    backend = "numpy"
+
+    def __init__(self, layers: List[Tuple[np.ndarray, np.ndarray, str]]):
+        if not layers:
+            raise ValueError("NumPy engine needs at least one Dense layer")
+        self.layers = [
+            (
+                np.ascontiguousarray(kernel, dtype=np.float32),
+                np.ascontiguousarray(bias, dtype=np.float32),
+                _activation_name(activation),
+            )
+            for kernel, bias, activation in layers
+        ]
+        self.n_features = self.layers[0][0].shape[0]
+
+    @classmethod
+    def from_layer_specs(cls, specs: List[dict]) -> "NumpyInferenceEngine":
+        """
+        Build the engine from an ordered list of layer specs.
+
+        Each spec is a dict with a ``type`` of ``dense`` (``kernel``, ``bias``,
+        ``activation``) or ``batch_norm`` (``gamma``, ``beta``, ``mean``,
+        ``variance``, ``epsilon``). Batch normalization is an affine map at
+        inference time, so it is folded into the kernel and bias of the next
+        Dense layer.
+        """
+        layers = []
+        pending_scale: Optional[np.ndarray] = None
+        pending_shift: Optional[np.ndarray] = None
+
+        for spec in specs:
+            if spec["type"] == "batch_norm":
+                scale = spec["gamma"] / np.sqrt(spec["variance"] + spec["epsilon"])
+                shift = spec["beta"] - spec["mean"] * scale
+                if pending_scale is not None:
+                    shift = pending_shift * scale + shift
+                    scale = pending_scale * scale
+                pending_scale, pending_shift = scale, shift
+            elif spec["type"] == "dense":
+                kernel = np.asarray(spec["kernel"], dtype=np.float64)
+                bias = spec.get("bias")
+                bias = np.zeros(kernel.shape[1]) if bias is None else np.asarray(bias, dtype=np.float64)
+                if pending_scale is not None:
+                    bias = pending_shift @ kernel + bias
+                    kernel = pending_scale[:, None] * kernel
+                    pending_scale = pending_shift = None
+                layers.append((kernel, bias, spec.get("activation", "linear")))
+            else:
+                raise ValueError(f"Unsupported layer type for NumPy engine: {spec['type']}")
+
+        if pending_scale is not None:
+            # Trailing normalization without a Dense layer to fold into
+            layers.append((np.diag(pending_scale), pending_shift, "linear"))
+
+        return cls(layers)
+
+    @classmethod
+    def from_keras_model(cls, model) -> "NumpyInferenceEngine":
+        """Extract the weights of an in-memory Keras Sequential model"""
+        specs = []
+        for layer in model.layers:
+            class_name = layer.__class__.__name__
+            config = layer.get_config()
+            weights = layer.get_weights()
+            if class_name == "Dense":
+                specs.append({
+                    "type": "dense",
+                    "kernel": weights[0],
+                    "bias": weights[1] if config.get("use_bias", True) else None,
+                    "activation": config.get("activation"),
+                })
+            elif class_name == "BatchNormalization":
+                specs.append(cls._batch_norm_spec(config, list(weights)))
+            elif class_name in ("InputLayer", "Dropout"):
+                continue
+            else:
+                raise ValueError(f"Unsupported layer for NumPy engine: {class_name}")
+        return cls.from_layer_specs(specs)
+
+    @classmethod
+    def from_h5(cls, path: str) -> "NumpyInferenceEngine":
+        """Read the weights straight from a Keras ``.h5`` file without TensorFlow"""
+        import h5py
+
+        with h5py.File(path, "r") as f:
+            model_config = json.loads(f.attrs["model_config"])
+            layer_configs = model_config["config"]
+            if isinstance(layer_configs, dict):
+                layer_configs = layer_configs["layers"]
+            weights_root = f["model_weights"] if "model_weights" in f else f
+
+            specs = []
+            for layer_config in layer_configs:
+                class_name = layer_config["class_name"]
+                config = layer_config["config"]
+                if class_name in ("InputLayer", "Dropout"):
+                    continue
+                arrays = cls._read_layer_weights(weights_root[config["name"]])
+                if class_name == "Dense":
+                    specs.append({
+                        "type": "dense",
+                        "kernel": arrays["kernel"],
+                        "bias": arrays.get("bias"),
+                        "activation": config.get("activation"),
+                    })
+                elif class_name == "BatchNormalization":
+                    specs.append(cls._batch_norm_spec(config, [
+                        arrays[name] for name in ("gamma", "beta", "moving_mean", "moving_variance")
+                        if name in arrays
+                    ]))
+                else:
+                    raise ValueError(f"Unsupported layer for NumPy engine: {class_name}")
+        return cls.from_layer_specs(specs)
+
+    @staticmethod
+    def _read_layer_weights(group) -> dict:
+        """Collect the datasets of an HDF5 layer group keyed by weight name"""
+        arrays = {}
+
+        def visit(name, obj):
+            if hasattr(obj, "shape"):
+                key = name.rsplit("/", 1)[-1].split(":")[0]
+                arrays[key] = np.asarray(obj)
+
+        group.visititems(visit)
+        return arrays
+
+    @staticmethod
+    def _batch_norm_spec(config: dict, weights: List[np.ndarray]) -> dict:
+        """Map BatchNormalization weights to a spec, honouring center/scale"""
+        size = weights[-1].shape[0]
+        gamma = weights.pop(0) if config.get("scale", True) else np.ones(size)
+        beta = weights.pop(0) if config.get("center", True) else np.zeros(size)
+        return {
+            "type": "batch_norm",
+            "gamma": np.asarray(gamma, dtype=np.float64),
+            "beta": np.asarray(beta, dtype=np.float64),
+            "mean": np.asarray(weights[0], dtype=np.float64),
+            "variance": np.asarray(weights[1], dtype=np.float64),
+            "epsilon": config.get("epsilon", 1e-3),
+        }
+
+    def with_input_scaling(self, mean: np.ndarray, scale: np.ndarray) -> "NumpyInferenceEngine":
+        """
+        Fold ``(x - mean) / scale`` into the first layer.
+
+        ``((x - m) / s) @ W + b == x @ (W / s[:, None]) + (b - (m / s) @ W)``,
+        so the returned engine takes raw features and needs no per-request scaling.
+        """
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+        kernel, bias, activation = self.layers[0]
+        kernel = kernel.astype(np.float64)
+        folded_kernel = kernel / scale[:, None]
+        folded_bias = bias.astype(np.float64) - (mean / scale) @ kernel
+        return NumpyInferenceEngine([(folded_kernel, folded_bias, activation)] + self.layers[1:])
+
+    def save(self, path: str, **metadata: str):
+        """Write the layers and string metadata to a single uncompressed ``.npz`` file"""
+        arrays = {f"meta_{key}": np.array(value) for key, value in metadata.items()}
+        arrays["activations"] = np.array([activation for _, _, activation in self.layers])
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["NumpyInferenceEngine", dict]:
+        """Read an engine written by ``save``, returning it with its metadata"""
+        with np.load(path, allow_pickle=False) as data:
+            activations = data["activations"].tolist()
+            layers = [
+                (data[f"kernel_{i}"], data[f"bias_{i}"], activation)
+                for i, activation in enumerate(activations)
+            ]
+            metadata = {
+                key[len("meta_"):]: str(data[key]) for key in data.files if key.startswith("meta_")
+            }
+        return cls(layers), metadata
+
+    def save_mmap(self, path: str):
+        """
+        Write the weights as one flat float32 ``.npy`` array plus a ``.json`` layout file.
+
+        Unlike ``save``, the result can be opened with ``load_mmap`` so that several
+        processes share a single read-only copy of the weights through the page cache.
+        """
+        offsets = []
+        position = 0
+        for kernel, bias, activation in self.layers:
+            offsets.append({
+                "kernel": [position, list(kernel.shape)],
+                "bias": [position + kernel.size, list(bias.shape)],
+                "activation": activation,
+            })
+            position += kernel.size + bias.size
+        flat = np.concatenate([np.concatenate([kernel.ravel(), bias.ravel()]) for kernel, bias, _ in self.layers])
+        np.save(path, flat, allow_pickle=False)
+        with open(f"{path}.json", "w") as f:
+            json.dump({"layers": offsets}, f)
+
+    @classmethod
+    def load_mmap(cls, path: str) -> "NumpyInferenceEngine":
+        """Map a file written by ``save_mmap`` read-only; the layers are views, not copies"""
+        with open(f"{path}.json") as f:
+            layout = json.load(f)
+        flat = np.load(path, mmap_mode="r", allow_pickle=False)
+
+        def view(entry):
+            start, shape = entry
+            return flat[start:start + int(np.prod(shape))].reshape(shape)
+
+        return cls([(view(layer["kernel"]), view(layer["bias"]), layer["activation"]) for layer in layout["layers"]])
+
+    def predict(self, X, verbose=0) -> np.ndarray:
+        """Run the forward pass, mirroring ``keras.Model.predict``"""
+        x = np.asarray(X, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        for kernel, bias, activation in self.layers:
+            x = x @ kernel
+            x += bias
+            _apply_activation(x, activation)
+        return x
+
+    def parity_error(self, model, n_samples: int = 256, seed: int = 0) -> float:
+        """Maximum absolute difference against ``model.predict`` on a random probe batch"""
+        rng = np.random.default_rng(seed)
+        probe = rng.standard_normal((n_samples, self.n_features)).astype(np.float32)
+        expected = np.asarray(model.predict(probe, verbose=0), dtype=np.float32)
+        return float(np.max(np.abs(self.predict(probe) - expected)))
+
+    def fingerprint(self) -> str:
+        """SHA-256 over the weights and activations"""
+        digest = hashlib.sha256()
+        for kernel, bias, activation in self.layers:
+            digest.update(kernel.tobytes())
+            digest.update(bias.tobytes())
+            digest.update(activation.encode())
+        return digest.hexdigest()
+
+    def describe(self) -> str:
+        """Human readable layer widths, e.g. ``8→10→64→1``"""
+        widths = [self.n_features] + [kernel.shape[1] for kernel, _, _ in self.layers]
+        return "→".join(str(w) for w in widths)
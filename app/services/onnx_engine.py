@@ -0,0 +1,132 @@
+"""
+ONNX export and ONNX Runtime inference for the diabetes prediction model
+"""
+import hashlib
+import numpy as np
+from typing import Tuple
+
+from app.services.numpy_engine import NumpyInferenceEngine
+
+ONNX_OPSET = 13
+# Oldest IR version that supports ONNX_OPSET, so older runtimes can load the file
+ONNX_IR_VERSION = 7
+ONNX_ACTIVATIONS = {"relu": "Relu", "sigmoid": "Sigmoid", "tanh": "Tanh"}
+
+
+def engine_to_onnx(engine: NumpyInferenceEngine, **metadata: str) -> bytes:
+    """
+    Express the engine's Dense stack as an ONNX graph of Gemm and activation nodes.
+
+    BatchNormalization and any input scaling are already folded into the engine's
+    weights, so the graph is as small as the model allows. Requires the ``onnx`` package.
+    """
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    nodes = []
+    initializers = []
+    current = "features"
+    for i, (kernel, bias, activation) in enumerate(engine.layers):
+        initializers.append(numpy_helper.from_array(kernel, f"kernel_{i}"))
+        initializers.append(numpy_helper.from_array(bias, f"bias_{i}"))
+        dense_output = f"dense_{i}"
+        nodes.append(helper.make_node("Gemm", [current, f"kernel_{i}", f"bias_{i}"], [dense_output]))
+        current = dense_output
+        if activation in ONNX_ACTIVATIONS:
+            nodes.append(helper.make_node(ONNX_ACTIVATIONS[activation], [current], [f"{activation}_{i}"]))
+            current = f"{activation}_{i}"
+    nodes.append(helper.make_node("Identity", [current], ["probability"]))
+
+    n_outputs = engine.layers[-1][0].shape[1]
+    graph = helper.make_graph(
+        nodes,
+        "diabetes_model",
+        [helper.make_tensor_value_info("features", TensorProto.FLOAT, ["batch", engine.n_features])],
+        [helper.make_tensor_value_info("probability", TensorProto.FLOAT, ["batch", n_outputs])],
+        initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", ONNX_OPSET)],
+                              producer_name="diabetes-prediction-api")
+    model.ir_version = ONNX_IR_VERSION
+    helper.set_model_props(model, {key: str(value) for key, value in metadata.items()})
+    onnx.checker.check_model(model)
+    return model.SerializeToString()
+
+
+class OnnxInferenceEngine:
+    """Runs an exported model in an ONNX Runtime CPU session"""
+
+    backend = "onnx"
+
+    def __init__(self, model_bytes: bytes, intra_op_threads: int = 0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        # A single chain of Gemms has nothing to run in parallel across operators
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+        self.model_bytes = model_bytes
+        self.intra_op_threads = intra_op_threads
+        self.session = ort.InferenceSession(model_bytes, sess_options=options, providers=["CPUExecutionProvider"])
+        session_input = self.session.get_inputs()[0]
+        self.input_name = session_input.name
+        self.n_features = session_input.shape[1]
+        self.metadata = dict(self.session.get_modelmeta().custom_metadata_map)
+
+    def __reduce__(self):
+        # Sessions cannot be pickled; worker processes rebuild theirs from the model bytes
+        return (self.__class__, (self.model_bytes, self.intra_op_threads))
+
+    @classmethod
+    def from_engine(cls, engine: NumpyInferenceEngine, intra_op_threads: int = 0,
+                    **metadata: str) -> "OnnxInferenceEngine":
+        """Export a NumPy engine to ONNX and open it in a session"""
+        return cls(engine_to_onnx(engine, **metadata), intra_op_threads=intra_op_threads)
+
+    def save(self, path: str, **metadata: str):
+        """Write the ONNX model, adding string metadata to its properties"""
+        model_bytes = self.model_bytes
+        metadata = {key: str(value) for key, value in metadata.items()}
+        # Unchanged metadata keeps the bytes, and so the fingerprint, identical
+        if any(self.metadata.get(key) != value for key, value in metadata.items()):
+            import onnx
+            from onnx import helper
+
+            model = onnx.load_from_string(model_bytes)
+            helper.set_model_props(model, {**self.metadata, **metadata})
+            model_bytes = model.SerializeToString()
+        with open(path, "wb") as f:
+            f.write(model_bytes)
+
+    @classmethod
+    def load(cls, path: str, intra_op_threads: int = 0) -> Tuple["OnnxInferenceEngine", dict]:
+        """Open an ONNX file written by ``save``, returning the engine with its metadata"""
+        with open(path, "rb") as f:
+            engine = cls(f.read(), intra_op_threads=intra_op_threads)
+        return engine, engine.metadata
+
+    def predict(self, X, verbose=0) -> np.ndarray:
+        """Run the forward pass, mirroring ``keras.Model.predict``"""
+        x = np.ascontiguousarray(X, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        return self.session.run(None, {self.input_name: x})[0]
+
+    def parity_error(self, model, n_samples: int = 256, seed: int = 0) -> float:
+        """Maximum absolute difference against ``model.predict`` on a random probe batch"""
+        rng = np.random.default_rng(seed)
+        probe = rng.standard_normal((n_samples, self.n_features)).astype(np.float32)
+        expected = np.asarray(model.predict(probe, verbose=0), dtype=np.float32)
+        return float(np.max(np.abs(self.predict(probe) - expected)))
+
+    def fingerprint(self) -> str:
+        """SHA-256 of the serialized model"""
+        return hashlib.sha256(self.model_bytes).hexdigest()
+
+    def describe(self) -> str:
+        threads = self.intra_op_threads or "default"
+        return f"ONNX Runtime, {self.n_features} features, intra-op threads {threads}"
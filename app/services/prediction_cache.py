@@ -0,0 +1,101 @@
+"""
+Bounded LRU/TTL cache of predictions keyed on the patient feature vector
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from app.core.metrics import registry
+from app.models.schemas import FEATURE_NAMES, PredictionRequest, PredictionResponse
+
+CACHE_EVENTS = registry.counter(
+    "diabetes_prediction_cache_events_total",
+    "Prediction cache lookups and removals by outcome (hit, miss, eviction, expiration)",
+    labelnames=("event",),
+)
+CACHE_SIZE = registry.gauge(
+    "diabetes_prediction_cache_entries",
+    "Entries currently held in the prediction cache",
+)
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache with per-entry TTL.
+
+    Keys are the eight features rounded to ``decimals`` places, so vectors that
+    differ only below that precision share an entry. Entries belong to one model
+    version; switching versions empties the cache.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, decimals: int = 2):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.decimals = decimals
+        self.version: Optional[str] = None
+        self._entries: "OrderedDict[Hashable, Tuple[float, PredictionResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"hit": 0, "miss": 0, "eviction": 0, "expiration": 0}
+
+    def key_for(self, request: PredictionRequest) -> Tuple[float, ...]:
+        """Canonical key: every feature as a float rounded to ``decimals`` (``-0.0`` folded into ``0.0``)"""
+        return tuple(round(float(getattr(request, name)), self.decimals) + 0.0 for name in FEATURE_NAMES)
+
+    def set_version(self, version: str):
+        """Bind the cache to a model version, dropping entries from any other version"""
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            CACHE_SIZE.set(len(self._entries))
+
+    def _count(self, event: str, amount: int = 1):
+        self._counts[event] += amount
+        CACHE_EVENTS.labels(event).inc(amount)
+
+    def get(self, key: Hashable) -> Optional[PredictionResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._count("miss")
+                return None
+            expires_at, response = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._count("expiration")
+                self._count("miss")
+                return None
+            self._entries.move_to_end(key)
+            self._count("hit")
+            return response
+
+    def put(self, key: Hashable, response: PredictionResponse):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._count("eviction")
+            size = len(self._entries)
+        CACHE_SIZE.set(size)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+            size = len(self._entries)
+        lookups = counts["hit"] + counts["miss"]
+        return {
+            "enabled": True,
+            "version": self.version,
+            "entries": size,
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "decimals": self.decimals,
+            "hit_rate": counts["hit"] / lookups if lookups else 0.0,
+            "hits": counts["hit"],
+            "misses": counts["miss"],
+            "evictions": counts["eviction"],
+            "expirations": counts["expiration"],
+        }
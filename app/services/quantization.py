@@ -0,0 +1,107 @@
+"""
+Post-training weight quantization for the NumPy inference engine
+"""
+import numpy as np
+from typing import List, Optional, Tuple
+
+from app.services.numpy_engine import NumpyInferenceEngine
+
+QUANTIZATION_PRECISIONS = ("int8", "float16")
+
+
+def quantize_kernel(kernel: np.ndarray, precision: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize a Dense kernel, returning the stored weights and per-output-channel scales.
+
+    int8 is symmetric per output column (``kernel ≈ q * scale``, ``q`` in [-127, 127]);
+    float16 stores the weights at half precision with unit scales.
+    """
+    kernel = np.asarray(kernel, dtype=np.float32)
+    if precision == "int8":
+        scale = np.abs(kernel).max(axis=0) / 127.0
+        scale[scale == 0] = 1.0
+        quantized = np.clip(np.rint(kernel / scale), -127, 127).astype(np.int8)
+        return quantized, scale.astype(np.float32)
+    if precision == "float16":
+        return kernel.astype(np.float16), np.ones(kernel.shape[1], dtype=np.float32)
+    raise ValueError(f"Unsupported quantization precision: {precision}")
+
+
+class QuantizedInferenceEngine(NumpyInferenceEngine):
+    """
+    NumPy engine whose Dense kernels are stored as int8 or float16.
+
+    Biases stay float32. The forward pass runs on the dequantized kernels, so it
+    computes exactly what the quantized weights represent while keeping NumPy's
+    float32 BLAS path; the stored model is 4x (int8) or 2x (float16) smaller.
+
+    The kernels are quantized as trained, on standardized inputs. Folding the scaler in
+    first would mix raw features of very different magnitudes in each int8 column, so
+    ``input_mean`` and ``input_scale`` are stored alongside and folded into the
+    dequantized first layer instead.
+    """
+
+    def __init__(self, quantized_layers: List[Tuple[np.ndarray, np.ndarray, np.ndarray, str]], precision: str,
+                 input_mean: Optional[np.ndarray] = None, input_scale: Optional[np.ndarray] = None):
+        if precision not in QUANTIZATION_PRECISIONS:
+            raise ValueError(f"Unsupported quantization precision: {precision}")
+        self.precision = precision
+        self.quantized_layers = [
+            (np.asarray(weights), np.asarray(scale, dtype=np.float32), np.asarray(bias, dtype=np.float32), activation)
+            for weights, scale, bias, activation in quantized_layers
+        ]
+        self.input_mean = None if input_mean is None else np.asarray(input_mean, dtype=np.float32)
+        self.input_scale = None if input_scale is None else np.asarray(input_scale, dtype=np.float32)
+        engine = NumpyInferenceEngine([
+            (weights.astype(np.float32) * scale, bias, activation)
+            for weights, scale, bias, activation in self.quantized_layers
+        ])
+        if self.input_mean is not None:
+            engine = engine.with_input_scaling(self.input_mean, self.input_scale)
+        super().__init__(engine.layers)
+
+    @classmethod
+    def from_engine(cls, engine: NumpyInferenceEngine, precision: str,
+                    input_mean: Optional[np.ndarray] = None,
+                    input_scale: Optional[np.ndarray] = None) -> "QuantizedInferenceEngine":
+        """Quantize every kernel of a float32 engine that takes standardized inputs"""
+        layers = []
+        for kernel, bias, activation in engine.layers:
+            weights, scale = quantize_kernel(kernel, precision)
+            layers.append((weights, scale, bias, activation))
+        return cls(layers, precision, input_mean, input_scale)
+
+    def save(self, path: str, **metadata: str):
+        """Write the quantized weights, scales and string metadata to an uncompressed ``.npz`` file"""
+        arrays = {f"meta_{key}": np.array(value) for key, value in metadata.items()}
+        arrays["precision"] = np.array(self.precision)
+        arrays["activations"] = np.array([activation for _, _, _, activation in self.quantized_layers])
+        if self.input_mean is not None:
+            arrays["input_mean"] = self.input_mean
+            arrays["input_scale"] = self.input_scale
+        for i, (weights, scale, bias, _) in enumerate(self.quantized_layers):
+            arrays[f"weights_{i}"] = weights
+            arrays[f"scale_{i}"] = scale
+            arrays[f"bias_{i}"] = bias
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["QuantizedInferenceEngine", dict]:
+        """Read an engine written by ``save``, returning it with its metadata"""
+        with np.load(path, allow_pickle=False) as data:
+            activations = data["activations"].tolist()
+            layers = [
+                (data[f"weights_{i}"], data[f"scale_{i}"], data[f"bias_{i}"], activation)
+                for i, activation in enumerate(activations)
+            ]
+            precision = str(data["precision"])
+            input_mean = data["input_mean"] if "input_mean" in data.files else None
+            input_scale = data["input_scale"] if "input_scale" in data.files else None
+            metadata = {
+                key[len("meta_"):]: str(data[key]) for key in data.files if key.startswith("meta_")
+            }
+        return cls(layers, precision, input_mean, input_scale), metadata
+
+    def describe(self) -> str:
+        return f"{super().describe()} ({self.precision})"
@@ -0,0 +1,225 @@
+"""
+Chunked parsing and formatting for streaming bulk scoring
+"""
+import asyncio
+import io
+import json
+import re
+import tempfile
+from typing import AsyncIterator, BinaryIO, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.encoding import encode_frame
+from app.services.executor import InferenceQueueFullError
+from app.services.validation import row_errors
+
+STREAM_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+CSV_OUTPUT_HEADER = "row,prediction,probability,confidence,error\n"
+
+SPOOL_BLOCK_SIZE = 1 << 16
+
+
+def stream_format(content_type: Optional[str]) -> Optional[str]:
+    """Map a Content-Type/Accept value to ``csv`` or ``ndjson``"""
+    if not content_type:
+        return None
+    return STREAM_FORMATS.get(content_type.split(";")[0].strip().lower())
+
+
+async def spool_upload(stream: AsyncIterator[bytes]) -> BinaryIO:
+    """
+    Copy an upload to a temporary file, keeping memory constant.
+
+    The body is spooled before the response starts because a streaming
+    response shares the ASGI receive channel with its disconnect listener.
+    """
+    spool = tempfile.TemporaryFile()
+    try:
+        async for data in stream:
+            spool.write(data)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+async def iter_file(file: BinaryIO, block_size: int = SPOOL_BLOCK_SIZE) -> AsyncIterator[bytes]:
+    """Read a file in fixed-size blocks"""
+    while True:
+        data = await asyncio.to_thread(file.read, block_size)
+        if not data:
+            break
+        yield data
+
+
+async def iter_line_chunks(stream: AsyncIterator[bytes], chunk_rows: int) -> AsyncIterator[List[bytes]]:
+    """Split a byte stream into lists of at most ``chunk_rows`` non-empty lines"""
+    buffer = b""
+    lines: List[bytes] = []
+    async for data in stream:
+        buffer += data
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            if line.strip():
+                lines.append(line)
+            if len(lines) >= chunk_rows:
+                yield lines
+                lines = []
+    if buffer.strip():
+        lines.append(buffer)
+    if lines:
+        yield lines
+
+
+class FeatureChunk:
+    """Encoded features of one chunk with per-row parse/validation errors"""
+
+    def __init__(self, start: int, features: np.ndarray, errors: List[Optional[str]]):
+        self.start = start
+        self.features = features
+        self.errors = errors
+        self.valid = np.array([error is None for error in errors], dtype=bool)
+
+
+def _encode(start: int, df: pd.DataFrame, parse_errors: List[Optional[str]]) -> FeatureChunk:
+    features = encode_frame(df)
+    errors = [parse or check for parse, check in zip(parse_errors, row_errors(features))]
+    return FeatureChunk(start, features, errors)
+
+
+def parse_csv_lines(start: int, header: bytes, lines: List[bytes]) -> FeatureChunk:
+    """Parse CSV data lines (one record per line) under the given header, turning malformed lines into row errors"""
+    try:
+        df = pd.read_csv(io.BytesIO(b"\n".join([header] + lines)), skipinitialspace=True)
+        if len(df) == len(lines):
+            return _encode(start, df, [None] * len(df))
+    except pd.errors.ParserError:
+        pass
+
+    # Some line is malformed (or a record spans lines): parse line by line to find it
+    columns = pd.read_csv(io.BytesIO(header), skipinitialspace=True).columns
+    rows, parse_errors = [], []
+    for line in lines:
+        try:
+            # Without the header, so extra fields are counted instead of becoming an index
+            row = pd.read_csv(io.BytesIO(line), header=None, skipinitialspace=True)
+            if row.shape[1] != len(columns):
+                raise pd.errors.ParserError(f"Expected {len(columns)} fields, saw {row.shape[1]}")
+            row.columns = columns
+            rows.append(row)
+            parse_errors.append(None)
+        except pd.errors.ParserError as e:
+            rows.append(pd.DataFrame(np.nan, index=[0], columns=columns))
+            # Line numbers in pandas' message would refer to the one-line parse
+            parse_errors.append(f"Malformed CSV: {re.sub(r' (in line|starting at row) [0-9]+', '', str(e).strip())}")
+    return _encode(start, pd.concat(rows, ignore_index=True), parse_errors)
+
+
+def parse_ndjson_lines(start: int, lines: List[bytes]) -> FeatureChunk:
+    """Parse NDJSON lines, turning malformed lines into row errors"""
+    records, parse_errors = [], []
+    for line in lines:
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("record is not a JSON object")
+            records.append(record)
+            parse_errors.append(None)
+        except ValueError as e:
+            records.append({})
+            parse_errors.append(f"Malformed JSON: {str(e)}")
+    return _encode(start, pd.DataFrame.from_records(records), parse_errors)
+
+
+def format_results(
+    output_format: str,
+    chunk: FeatureChunk,
+    predictions: np.ndarray,
+    probabilities: np.ndarray,
+    confidences: np.ndarray,
+) -> str:
+    """Render scored rows of a chunk; ``predictions`` etc. cover only the valid rows"""
+    scored = iter(zip(predictions.tolist(), probabilities.tolist(), confidences.tolist()))
+    out = []
+    for offset, error in enumerate(chunk.errors):
+        row = chunk.start + offset
+        if error is None:
+            pred, proba, conf = next(scored)
+            if output_format == "csv":
+                out.append(f"{row},{pred},{proba},{conf},\n")
+            else:
+                out.append(json.dumps({"row": row, "prediction": pred, "probability": proba, "confidence": conf}) + "\n")
+        else:
+            out.append(format_error(output_format, row, error))
+    return "".join(out)
+
+
+def format_error(output_format: str, row: int, error: str) -> str:
+    """Render an error record for one row"""
+    if output_format == "csv":
+        escaped = error.replace('"', '""')
+        return f'{row},,,,"{escaped}"\n'
+    return json.dumps({"row": row, "error": error}) + "\n"
+
+
+def score_chunk(model_service, chunk: FeatureChunk, output_format: str) -> str:
+    """Score the valid rows of a chunk in one forward pass and render every row"""
+    if not chunk.valid.any():
+        empty = np.empty(0)
+        return format_results(output_format, chunk, empty, empty, empty)
+    predictions, probabilities, confidences = model_service.predict_arrays(chunk.features[chunk.valid])
+    return format_results(output_format, chunk, predictions, probabilities, confidences)
+
+
+async def score_stream(
+    model_service,
+    stream: AsyncIterator[bytes],
+    input_format: str,
+    output_format: str,
+    chunk_rows: int,
+) -> AsyncIterator[str]:
+    """
+    Parse, score and render an uploaded stream chunk by chunk.
+
+    Only one chunk is held in memory at a time. When the inference executor
+    is saturated the stream waits instead of failing, since partial results
+    have already been sent.
+    """
+    if output_format == "csv":
+        yield CSV_OUTPUT_HEADER
+
+    header: Optional[bytes] = None
+    start = 0
+    async for lines in iter_line_chunks(stream, chunk_rows):
+        if input_format == "csv" and header is None:
+            header, lines = lines[0], lines[1:]
+            if not lines:
+                continue
+
+        def work(lines=lines, start=start):
+            if input_format == "csv":
+                chunk = parse_csv_lines(start, header, lines)
+            else:
+                chunk = parse_ndjson_lines(start, lines)
+            return score_chunk(model_service, chunk, output_format)
+
+        while True:
+            try:
+                yield await model_service.run_in_executor(work)
+                break
+            except InferenceQueueFullError:
+                await asyncio.sleep(0.05)
+            except ValueError as e:
+                # Schema problems (e.g. missing columns) affect every chunk
+                yield format_error(output_format, start, f"Stream aborted: {str(e)}")
+                return
+        start += len(lines)
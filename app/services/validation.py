@@ -0,0 +1,98 @@
+"""
+Vectorized validation of raw (N, 8) feature arrays against FEATURE_RANGES
+
+Checks every column of a batch at once instead of building one PredictionRequest
+per row. ``feature_errors`` reports failures in the same shape, order and wording
+as pydantic, so batch responses match those of the single-request endpoint.
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.models.schemas import FEATURE_NAMES, FEATURE_RANGES, PredictionRequest
+
+FEATURE_LOWER = np.array([FEATURE_RANGES[name][0] for name in FEATURE_NAMES], dtype=np.float32)
+FEATURE_UPPER = np.array([FEATURE_RANGES[name][1] for name in FEATURE_NAMES], dtype=np.float32)
+INTEGER_FEATURES = np.array(
+    [PredictionRequest.model_fields[name].annotation is int for name in FEATURE_NAMES]
+)
+
+
+def _fractional(features: np.ndarray) -> np.ndarray:
+    """Mask of non-integer values in integer features"""
+    fractional = np.zeros(features.shape, dtype=bool)
+    integers = features[:, INTEGER_FEATURES]
+    fractional[:, INTEGER_FEATURES] = np.isfinite(integers) & (integers != np.round(integers))
+    return fractional
+
+
+def invalid_rows(features: np.ndarray) -> np.ndarray:
+    """Boolean mask of rows with missing, out-of-range or non-integer binary values"""
+    bad = ~np.isfinite(features)
+    bad |= features < FEATURE_LOWER
+    bad |= features > FEATURE_UPPER
+    bad |= _fractional(features)
+    return bad.any(axis=1)
+
+
+def describe_invalid_row(row: np.ndarray) -> str:
+    """Error message naming the offending features of one row"""
+    names = [
+        name for i, name in enumerate(FEATURE_NAMES)
+        if not np.isfinite(row[i])
+        or not FEATURE_LOWER[i] <= row[i] <= FEATURE_UPPER[i]
+        or (INTEGER_FEATURES[i] and row[i] != round(row[i]))
+    ]
+    return f"Invalid or out-of-range values for: {', '.join(names)}"
+
+
+def row_errors(features: np.ndarray) -> List[Optional[str]]:
+    """Per-row error message, ``None`` for valid rows"""
+    errors: List[Optional[str]] = [None] * len(features)
+    for i in np.flatnonzero(invalid_rows(features)):
+        errors[i] = describe_invalid_row(features[i])
+    return errors
+
+
+def _error(kind: str, column: int, value: float) -> dict:
+    """One pydantic-style error for the value in ``column``"""
+    lower, upper = FEATURE_RANGES[FEATURE_NAMES[column]]
+    if not INTEGER_FEATURES[column]:
+        # pydantic reports the bounds of float fields as floats
+        lower, upper = float(lower), float(upper)
+    if kind == "finite_number":
+        # NaN and infinity have no JSON form
+        return {"type": kind, "msg": "Input should be a finite number", "input": str(value)}
+    if kind == "int_from_float":
+        return {"type": kind, "msg": "Input should be a valid integer, got a number with a fractional part",
+                "input": value}
+    if kind == "greater_than_equal":
+        return {"type": kind, "msg": f"Input should be greater than or equal to {lower:g}", "input": value,
+                "ctx": {"ge": lower}}
+    return {"type": kind, "msg": f"Input should be less than or equal to {upper:g}", "input": value,
+            "ctx": {"le": upper}}
+
+
+def feature_errors(features: np.ndarray, loc: Sequence = ("body",)) -> List[dict]:
+    """
+    Per-field errors for every invalid value, row by row in feature order.
+
+    Each error is located at ``(*loc, row, feature)``. Like pydantic, a fractional
+    integer feature is reported as such rather than as out of range.
+    """
+    kinds = np.full(features.shape, "", dtype=object)
+    kinds[features > FEATURE_UPPER] = "less_than_equal"
+    kinds[features < FEATURE_LOWER] = "greater_than_equal"
+    kinds[_fractional(features)] = "int_from_float"
+    kinds[~np.isfinite(features)] = "finite_number"
+
+    errors = []
+    for row, column in zip(*np.nonzero(kinds != "")):
+        # Shortest repr of the value, so 120.3 is reported as sent rather than as 120.30000305
+        value = float(str(features[row, column]))
+        # Whole numbers are reported as ints, except ones like 1e300 that only float64 can hold
+        if value.is_integer() and abs(value) < 2 ** 53:
+            value = int(value)
+        error = _error(kinds[row, column], column, value)
+        errors.append({"type": error.pop("type"), "loc": (*loc, int(row), FEATURE_NAMES[column]), **error})
+    return errors
@@ -0,0 +1,265 @@
+"""
+Benchmark runner for the inference and API hot paths
+
+Usage:
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --output new.json --compare bench.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.models.schemas import PredictionRequest
+
+BATCH_SIZES = (1, 10, 100, 10_000)
+
+SAMPLE_PATIENT = {
+    "gender": 1,
+    "age": 45.0,
+    "hypertension": 0,
+    "heart_disease": 0,
+    "bmi": 25.5,
+    "hba1c_level": 5.2,
+    "blood_glucose_level": 120.0,
+    "is_smoker": 0,
+}
+
+
+def _summarize(samples: List[float], items_per_call: int) -> dict:
+    """Latency percentiles in microseconds plus item throughput"""
+    latencies = np.array(samples) * 1e6
+    total = float(np.sum(samples))
+    return {
+        "calls": len(samples),
+        "items_per_call": items_per_call,
+        "p50_us": float(np.percentile(latencies, 50)),
+        "p95_us": float(np.percentile(latencies, 95)),
+        "p99_us": float(np.percentile(latencies, 99)),
+        "mean_us": float(latencies.mean()),
+        "throughput_per_s": len(samples) * items_per_call / total if total else 0.0,
+    }
+
+
+def _repeat_for(items_per_call: int, budget: int) -> int:
+    """Fewer calls for large batches so every case takes comparable time"""
+    return max(20, min(budget, budget * 10 // max(items_per_call, 1)))
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 5, items_per_call: int = 1) -> dict:
+    """Time ``fn`` ``repeat`` times after ``warmup`` untimed calls"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return _summarize(samples, items_per_call)
+
+
+async def measure_async(fn: Callable[[], Awaitable[object]], repeat: int, warmup: int = 5,
+                        items_per_call: int = 1) -> dict:
+    """Async counterpart of ``measure``"""
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return _summarize(samples, items_per_call)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(budget: int) -> dict:
+    """Run every benchmark case and return the results document"""
+    import httpx
+
+    import app.main as main_module
+    from app.core.config import settings
+    from app.services.model_service import ModelService
+    from app.services.prediction_cache import PredictionCache
+
+    # Every case repeats SAMPLE_PATIENT, so with the prediction cache on they would time
+    # cache hits instead of forward passes; the cache gets its own case at the end
+    cache_size = settings.PREDICTION_CACHE_SIZE
+    settings.PREDICTION_CACHE_SIZE = 0
+    service = ModelService()
+    try:
+        await service.load_model()
+    finally:
+        settings.PREDICTION_CACHE_SIZE = cache_size
+    request = PredictionRequest(**SAMPLE_PATIENT)
+    results: Dict[str, dict] = {}
+
+    results["validation.PredictionRequest"] = measure(
+        lambda: PredictionRequest(**SAMPLE_PATIENT), _repeat_for(1, budget)
+    )
+    results["prepare_input_data"] = measure(
+        lambda: service._prepare_input_data(request), _repeat_for(1, budget)
+    )
+    results["predict"] = measure(lambda: service.predict(request), _repeat_for(1, budget))
+    for size in BATCH_SIZES:
+        batch = [request] * size
+        results[f"predict_batch[{size}]"] = measure(
+            lambda: service.predict_batch(batch), _repeat_for(size, budget), items_per_call=size
+        )
+
+    # In-process ASGI round trip through routing, validation and serialization
+    main_module.model_service = service
+    transport = httpx.ASGITransport(app=main_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def post_predict():
+            response = await client.post("/api/v1/predict", json=SAMPLE_PATIENT)
+            response.raise_for_status()
+
+        results["api./api/v1/predict"] = await measure_async(post_predict, _repeat_for(1, budget) // 5)
+
+    results.update(await transport_benchmarks(main_module.app, budget))
+
+    service.cache = PredictionCache(
+        max_size=max(settings.PREDICTION_CACHE_SIZE, 1),
+        ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS,
+        decimals=settings.PREDICTION_CACHE_DECIMALS
+    )
+    service.cache.set_version(service.model_version)
+    results["predict[cached]"] = measure(lambda: service.predict(request), _repeat_for(1, budget))
+
+    await service.shutdown()
+    main_module.model_service = None
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "backend": service.backend,
+        "results": results,
+    }
+
+
+async def transport_benchmarks(app, budget: int, batch_size: int = 100) -> Dict[str, dict]:
+    """REST (JSON over HTTP/1.1) against gRPC, both over loopback sockets and served by the same ModelService"""
+    import httpx
+    import uvicorn
+
+    results: Dict[str, dict] = {}
+    repeat = _repeat_for(1, budget) // 5
+    batch_repeat = _repeat_for(batch_size, budget) // 5
+    rows = np.tile(np.array(list(SAMPLE_PATIENT.values()), dtype=np.float32), (batch_size, 1))
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, lifespan="off", log_level="warning"))
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            async def post_predict():
+                response = await client.post("/api/v1/predict", json=SAMPLE_PATIENT)
+                response.raise_for_status()
+
+            async def post_batch():
+                response = await client.post("/api/v1/predict/batch", json={"patients": [SAMPLE_PATIENT] * batch_size})
+                response.raise_for_status()
+
+            async def post_packed_batch():
+                response = await client.post("/api/v1/predict/batch", content=rows.tobytes(),
+                                             headers={"Content-Type": "application/octet-stream"})
+                response.raise_for_status()
+
+            results["http./api/v1/predict"] = await measure_async(post_predict, repeat)
+            results[f"http./api/v1/predict/batch[{batch_size}]"] = await measure_async(
+                post_batch, batch_repeat, items_per_call=batch_size
+            )
+            results[f"http./api/v1/predict/batch[{batch_size}].float32"] = await measure_async(
+                post_packed_batch, batch_repeat, items_per_call=batch_size
+            )
+    finally:
+        server.should_exit = True
+        await serving
+
+    try:
+        import grpc
+
+        from app.main import model_service
+        from app.rpc import diabetes_pb2, diabetes_pb2_grpc
+        from app.rpc.server import create_server
+    except ImportError:
+        print("grpcio is not installed; skipping the gRPC cases")
+        return results
+
+    grpc_server, grpc_port = create_server(model_service, "127.0.0.1", 0)
+    await grpc_server.start()
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{grpc_port}") as channel:
+            stub = diabetes_pb2_grpc.DiabetesPredictionStub(channel)
+            patient = diabetes_pb2.Patient(**SAMPLE_PATIENT)
+            batch = diabetes_pb2.BatchRequest(features=rows.ravel().tolist())
+
+            results["grpc.Predict"] = await measure_async(lambda: stub.Predict(patient), repeat)
+            results[f"grpc.PredictBatch[{batch_size}]"] = await measure_async(
+                lambda: stub.PredictBatch(batch), batch_repeat, items_per_call=batch_size
+            )
+    finally:
+        await grpc_server.stop(grace=None)
+    return results
+
+
+def print_report(report: dict, baseline: Optional[dict] = None, threshold: float = 0.10) -> bool:
+    """Print a results table; returns False if any p50 regressed beyond ``threshold``"""
+    ok = True
+    print(f"commit={report['commit']} backend={report['backend']} python={report['python']}")
+    print(f"{'case':32} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'items/s':>12} {'Δp50':>8}")
+    for name, stats in report["results"].items():
+        delta = ""
+        previous = (baseline or {}).get("results", {}).get(name)
+        if previous and previous["p50_us"]:
+            change = stats["p50_us"] / previous["p50_us"] - 1
+            delta = f"{change:+.1%}"
+            if change > threshold:
+                delta += " !"
+                ok = False
+        print(f"{name:32} {stats['p50_us']:10.1f} {stats['p95_us']:10.1f} {stats['p99_us']:10.1f} "
+              f"{stats['throughput_per_s']:12,.0f} {delta:>8}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark inference and API hot paths")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON from a previous run")
+    parser.add_argument("--budget", type=int, default=1000, help="Calls per single-item case")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative p50 slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmarks(args.budget))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    if not print_report(report, baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,8 +27,8 @@ if [ ! -f "streamlit_app.py" ]; then
     exit 1
 fi
 
-# Check if model exists
-if [ ! -f "notebooks/model.h5" ]; then
+# Check if model exists (API mode scores through the API instead)
+if [ "$PREDICTION_MODE" != "api" ] && [ ! -f "notebooks/model.h5" ]; then
     echo "Model notebooks/model.h5 not found!"
     echo "   Make sure the model is in the correct location."
     exit 1
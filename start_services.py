@@ -2,11 +2,14 @@
 """
 Script to start both API and Streamlit services
 """
+import argparse
+import json
 import subprocess
 import sys
 import time
 import threading
 import os
+import urllib.request
 from pathlib import Path
 
 def get_python_executable():
@@ -45,24 +48,52 @@ def get_streamlit_executable():
     print("Using system Python for Streamlit (no virtual environment found)")
     return sys.executable
 
-def start_api():
+def start_api(workers=1):
     """Start the FastAPI server"""
     print("🚀 Starting FastAPI server...")
     python_exe = get_python_executable()
     # Run from the project root, not from inside app directory
-    subprocess.run([python_exe, "-m", "uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000", "--reload"])
+    if workers > 1:
+        # Production mode: supervised workers sharing memory-mapped model weights
+        subprocess.run([python_exe, "-m", "app.serve", "--host", "0.0.0.0", "--port", "8000", "--workers", str(workers)])
+    else:
+        subprocess.run([python_exe, "-m", "uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000", "--reload"])
+
+def api_serves_trained_model(url, timeout=30):
+    """Wait for the API and report whether it serves a trained model (not the random placeholder)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/api/v1/model/info", timeout=2) as response:
+                return json.load(response).get("trained", False)
+        except (OSError, ValueError):
+            time.sleep(1)
+    return False
 
 def start_streamlit():
     """Start the Streamlit app"""
     print("⏳ Waiting for API to start...")
-    time.sleep(5)  # Wait for API to start
+    api_url = "http://localhost:8000"
+    env = dict(os.environ)
+    if api_serves_trained_model(api_url):
+        # Score through the API started alongside instead of loading the model a second time
+        print("🔗 API serves a trained model, the app will score through it")
+        env.update({"PREDICTION_MODE": "api", "DIABETES_API_URL": api_url})
+    else:
+        print("⚠️ API has no trained model (placeholder weights), the app will load notebooks/model.h5 itself")
+        env["PREDICTION_MODE"] = "local"
     print("🎨 Starting Streamlit app...")
     # Don't change directory - stay in project root
     python_exe = get_streamlit_executable()
-    subprocess.run([python_exe, "-m", "streamlit", "run", "streamlit_app.py"])
+    subprocess.run([python_exe, "-m", "streamlit", "run", "streamlit_app.py"], env=env)
 
 def main():
     """Main function to start both services"""
+    parser = argparse.ArgumentParser(description="Start the API and Streamlit services")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="API worker processes (more than 1 disables auto-reload)")
+    args = parser.parse_args()
+    
     print("🏥 Starting Diabetes Prediction System...")
     print("=" * 50)
     
@@ -72,7 +103,7 @@ def main():
         sys.exit(1)
     
     # Start API in a separate thread
-    api_thread = threading.Thread(target=start_api, daemon=True)
+    api_thread = threading.Thread(target=start_api, args=(args.workers,), daemon=True)
     api_thread.start()
     
     # Start Streamlit in the main thread
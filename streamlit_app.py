@@ -1,14 +1,50 @@
 """
-Streamlit app for Diabetes Prediction - Direct Model Loading
+Streamlit app for Diabetes Prediction
+
+PREDICTION_MODE=local (default) loads notebooks/model.h5 in the Streamlit process.
+PREDICTION_MODE=api scores through the FastAPI service at DIABETES_API_URL with a pooled
+HTTP client instead, so the UI runs as a thin frontend without TensorFlow.
 """
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+import hashlib
+import io
 import os
 from datetime import datetime
 
+from api_client import APIError, DiabetesAPIClient, patient_features, patient_request
+
+PREDICTION_MODE = os.getenv("PREDICTION_MODE", "local")
+
+# Form values, one column each in bulk and sweep tables
+FORM_COLUMNS = ["gender", "age", "hypertension", "heart_disease", "bmi", "hba1c_level",
+                "blood_glucose_level", "smoking_history"]
+SMOKING_CATEGORIES = ["never", "No Info", "current", "former", "ever", "not current"]
+# Valid ranges of the continuous inputs, same as the form's sliders
+CONTINUOUS_RANGES = {
+    "age": (0.0, 120.0),
+    "bmi": (10.0, 100.0),
+    "hba1c_level": (0.0, 20.0),
+    "blood_glucose_level": (0.0, 500.0),
+}
+# StandardScaler statistics of the continuous features, from the notebooks
+CONTINUOUS_FEATURES_STATS = {
+    'age': {'mean': 42.0, 'std': 22.5},
+    'bmi': {'mean': 27.0, 'std': 6.5},
+    'hba1c_level': {'mean': 5.5, 'std': 1.2},
+    'blood_glucose_level': {'mean': 140.0, 'std': 40.0}
+}
+# Sweepable variables: label and default range
+SWEEP_VARIABLES = {
+    "hba1c_level": ("HbA1c Level", 4.0, 10.0),
+    "blood_glucose_level": ("Blood Glucose Level", 80.0, 300.0),
+    "bmi": ("BMI", 15.0, 50.0),
+    "age": ("Age", 20.0, 80.0),
+}
+
 # Page configuration
 st.set_page_config(
     page_title="Diabetes Prediction App",
@@ -270,59 +306,51 @@ def load_model():
         st.error(f"Error loading model: {str(e)}")
         return None
 
-def prepare_input_data(gender, age, hypertension, heart_disease, bmi, hba1c_level, blood_glucose_level, smoking_history):
-    """Prepare input data for prediction with proper normalization and one-hot encoding"""
-    # Create features in the same order as the notebook
-    # Features: ['age', 'hypertension', 'heart_disease', 'bmi', 'HbA1c_level', 'blood_glucose_level', 
-    #           'gender_Male', 'smoking_history_current', 'smoking_history_ever', 'smoking_history_former', 
-    #           'smoking_history_never', 'smoking_history_not current']
-    
-    # Convert gender to binary (Male = 1, Female = 0)
-    gender_male = 1 if gender == "Male" else 0
-    
-    # Convert smoking history to one-hot encoding
-    smoking_current = 1 if smoking_history == "current" else 0
-    smoking_ever = 1 if smoking_history == "ever" else 0
-    smoking_former = 1 if smoking_history == "former" else 0
-    smoking_never = 1 if smoking_history == "never" else 0
-    smoking_not_current = 1 if smoking_history == "not current" else 0
-    
-    # Convert to array in the correct order (12 features)
-    input_data = np.array([[
-        age,                    # 0: age (continuous)
-        hypertension,           # 1: hypertension (0 or 1)
-        heart_disease,          # 2: heart_disease (0 or 1)
-        bmi,                    # 3: bmi (continuous)
-        hba1c_level,           # 4: hba1c_level (continuous)
-        blood_glucose_level,   # 5: blood_glucose_level (continuous)
-        gender_male,           # 6: gender_Male (0 or 1)
-        smoking_current,       # 7: smoking_history_current (0 or 1)
-        smoking_ever,          # 8: smoking_history_ever (0 or 1)
-        smoking_former,        # 9: smoking_history_former (0 or 1)
-        smoking_never,         # 10: smoking_history_never (0 or 1)
-        smoking_not_current    # 11: smoking_history_not current (0 or 1)
-    ]])
+@st.cache_resource
+def get_api_client():
+    """One pooled keep-alive API client shared by every session of this server"""
+    return DiabetesAPIClient()
+
+def prepare_input_batch(patients):
+    """Prepare a table of form values for prediction with proper normalization and one-hot encoding"""
+    # Features in the same order as the notebook:
+    # ['age', 'hypertension', 'heart_disease', 'bmi', 'HbA1c_level', 'blood_glucose_level', 
+    #  'gender_Male', 'smoking_history_current', 'smoking_history_ever', 'smoking_history_former', 
+    #  'smoking_history_never', 'smoking_history_not current']
+    columns = [
+        patients['age'],
+        patients['hypertension'],
+        patients['heart_disease'],
+        patients['bmi'],
+        patients['hba1c_level'],
+        patients['blood_glucose_level'],
+        patients['gender'] == "Male",
+    ]
+    # One-hot smoking history ("No Info" is the dropped category)
+    for category in ["current", "ever", "former", "never", "not current"]:
+        columns.append(patients['smoking_history'] == category)
+    input_data = np.column_stack(columns).astype(np.float64)
     
     # Apply StandardScaler normalization to continuous features
-    # Based on the notebooks, these features are normalized: age, bmi, hba1c_level, blood_glucose_level
-    continuous_features_stats = {
-        'age': {'mean': 42.0, 'std': 22.5},
-        'bmi': {'mean': 27.0, 'std': 6.5},
-        'hba1c_level': {'mean': 5.5, 'std': 1.2},
-        'blood_glucose_level': {'mean': 140.0, 'std': 40.0}
-    }
-    
-    # Apply normalization to continuous features
-    continuous_indices = [0, 3, 4, 5]  # age, bmi, hba1c_level, blood_glucose_level
-    feature_names = ['age', 'bmi', 'hba1c_level', 'blood_glucose_level']
-    
-    for idx, feature_name in zip(continuous_indices, feature_names):
-        if feature_name in continuous_features_stats:
-            stats = continuous_features_stats[feature_name]
-            input_data[0, idx] = (input_data[0, idx] - stats['mean']) / stats['std']
+    for idx, feature_name in zip([0, 3, 4, 5], ['age', 'bmi', 'hba1c_level', 'blood_glucose_level']):
+        stats = CONTINUOUS_FEATURES_STATS[feature_name]
+        input_data[:, idx] = (input_data[:, idx] - stats['mean']) / stats['std']
     
     return input_data
 
+def prepare_input_data(gender, age, hypertension, heart_disease, bmi, hba1c_level, blood_glucose_level, smoking_history):
+    """Prepare input data for prediction with proper normalization and one-hot encoding"""
+    return prepare_input_batch(pd.DataFrame([{
+        "gender": gender,
+        "age": age,
+        "hypertension": hypertension,
+        "heart_disease": heart_disease,
+        "bmi": bmi,
+        "hba1c_level": hba1c_level,
+        "blood_glucose_level": blood_glucose_level,
+        "smoking_history": smoking_history
+    }]))
+
 def get_confidence_level(probability):
     """Determine confidence level based on probability"""
     if probability < 0.3 or probability > 0.7:
@@ -332,34 +360,145 @@ def get_confidence_level(probability):
     else:
         return "Low"
 
-def main():
-    # Load model
-    with st.spinner("Loading diabetes prediction model..."):
-        model = load_model()
+def predict_patient(patient_data, model=None, client=None):
+    """Return (prediction, probability, confidence) from the API client, or from the in-process model"""
+    if client is not None:
+        result = client.predict(patient_request(**patient_data))
+        return result["prediction"], result["probability"], result["confidence"]
     
-    if model is None:
-        st.error("❌ Could not load the model. Please check if model.h5 exists in the notebooks folder.")
-        st.stop()
+    input_data = prepare_input_data(**patient_data)
+    prediction_proba = model.predict(input_data, verbose=0)[0][0]
+    prediction = 1 if prediction_proba > 0.5 else 0
+    return prediction, prediction_proba, get_confidence_level(prediction_proba)
+
+def score_patients(patients, model=None, client=None):
+    """Score a table of form values in one batched call, returning prediction, probability and confidence columns"""
+    if client is not None:
+        return client.predict_batch(patient_features(patients))
     
-    # Sidebar
-    st.sidebar.title("Patient Information")
-    st.sidebar.markdown("Enter the patient's health metrics below:")
+    probabilities = model.predict(prepare_input_batch(patients), batch_size=4096, verbose=0).reshape(-1)
+    return pd.DataFrame({
+        "prediction": (probabilities > 0.5).astype(np.int8),
+        "probability": probabilities,
+        "confidence": [get_confidence_level(p) for p in probabilities]
+    })
+
+def read_patients_csv(data):
+    """Parse an uploaded CSV into form values, returning the valid rows and how many were dropped"""
+    df = pd.read_csv(io.BytesIO(data)).rename(columns={"HbA1c_level": "hba1c_level"})
+    if "smoking_history" not in df and "is_smoker" in df:
+        # The API schema only says whether the patient smokes
+        df["smoking_history"] = np.where(df["is_smoker"] == 1, "current", "never")
+    missing = [column for column in FORM_COLUMNS if column not in df]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    if pd.api.types.is_numeric_dtype(df["gender"]):
+        df["gender"] = np.where(df["gender"] == 1, "Male", "Female")
     
-    # Input form
-    with st.sidebar.form("patient_form"):
-        gender = st.selectbox("Gender", ["Female", "Male"], format_func=lambda x: f"{'👩' if x == 'Female' else '👨'} {x}")
-        age = st.slider("Age", min_value=0, max_value=120, value=45)
-        hypertension = st.selectbox("Hypertension", ["No", "Yes"], format_func=lambda x: f"{'❌' if x == 'No' else '⚠️'} {x}")
-        heart_disease = st.selectbox("Heart Disease", ["No", "Yes"], format_func=lambda x: f"{'❌' if x == 'No' else '⚠️'} {x}")
-        bmi = st.slider("BMI (Body Mass Index)", min_value=10.0, max_value=100.0, value=25.0, step=0.1)
-        hba1c_level = st.slider("HbA1c Level", min_value=0.0, max_value=20.0, value=5.2, step=0.1)
-        blood_glucose_level = st.slider("Blood Glucose Level", min_value=0.0, max_value=500.0, value=120.0, step=1.0)
-        smoking_history = st.selectbox("Smoking History", 
-                                     ["never", "No Info", "current", "former", "ever", "not current"], 
-                                     format_func=lambda x: f"{'🚬' if x in ['current', 'former', 'ever'] else '❌'} {x}")
-        
-        submitted = st.form_submit_button("🔍 Predict Diabetes Risk", use_container_width=True)
+    valid = df["smoking_history"].isin(SMOKING_CATEGORIES)
+    for column in ["hypertension", "heart_disease"]:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+        valid &= df[column].isin([0, 1])
+    for column, (lower, upper) in CONTINUOUS_RANGES.items():
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+        valid &= df[column].between(lower, upper)
+    return df.loc[valid, FORM_COLUMNS].reset_index(drop=True), int((~valid).sum())
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def score_upload(file_hash, model_version, _data, _model=None, _client=None):
+    """Score an uploaded CSV; cached on the file's hash and the serving model's version"""
+    patients, dropped = read_patients_csv(_data)
+    scores = score_patients(patients, _model, _client)
+    return pd.concat([patients, scores], axis=1), dropped
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def score_sweep(base_patient, variable, start, stop, points, model_version, _model=None, _client=None):
+    """Score the base patient with ``variable`` swept over ``points`` values, as one batch"""
+    patients = pd.DataFrame([base_patient] * points)
+    patients[variable] = np.linspace(start, stop, points)
+    scores = score_patients(patients, _model, _client)
+    return pd.concat([patients[[variable]], scores], axis=1)
+
+def render_bulk_upload(model, client, model_version):
+    """Bulk tab: score every patient of an uploaded CSV"""
+    st.markdown("### Bulk Scoring")
+    st.caption(
+        "Upload a CSV in the `diabetes_prediction_dataset.csv` schema (or the API's, with binary "
+        "`gender` and `is_smoker`). Every row is scored in one batch; results are cached per file."
+    )
+    uploaded = st.file_uploader("Patients CSV", type="csv")
+    if uploaded is None:
+        return
+    
+    data = uploaded.getvalue()
+    try:
+        with st.spinner("Scoring patients..."):
+            results, dropped = score_upload(hashlib.sha256(data).hexdigest(), model_version, data, model, client)
+    except (ValueError, APIError) as e:
+        st.error(f"Could not score the file: {str(e)}")
+        return
+    if dropped:
+        st.warning(f"⚠️ Skipped {dropped:,} rows with missing or out-of-range values")
+    if results.empty:
+        return
     
+    col_metric1, col_metric2, col_metric3 = st.columns(3)
+    with col_metric1:
+        st.metric(label="Patients Scored", value=f"{len(results):,}")
+    with col_metric2:
+        st.metric(label="High Risk", value=f"{int(results['prediction'].sum()):,}",
+                  delta=f"{results['prediction'].mean():.1%} of patients", delta_color="off")
+    with col_metric3:
+        st.metric(label="Mean Risk", value=f"{results['probability'].mean():.1%}")
+    
+    fig = px.histogram(
+        results.assign(risk=np.where(results["prediction"] == 1, "High Risk", "Low Risk")),
+        x="probability", color="risk", nbins=50,
+        title="Predicted Risk Distribution",
+        color_discrete_map={'Low Risk': '#4caf50', 'High Risk': '#f44336'}
+    )
+    fig.update_layout(height=350, xaxis_title="Probability of diabetes")
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.dataframe(results.sort_values("probability", ascending=False).head(1000), use_container_width=True)
+    st.download_button("📥 Download results CSV", results.to_csv(index=False),
+                       file_name="diabetes_predictions.csv", mime="text/csv")
+
+def render_sweep(base_patient, model, client, model_version):
+    """What-if tab: sweep one measurement of the sidebar patient and chart the risk"""
+    st.markdown("### What-if Sweep")
+    st.caption("Vary one measurement of the patient in the sidebar and watch the predicted risk change.")
+    
+    variable = st.selectbox("Variable", list(SWEEP_VARIABLES), format_func=lambda v: SWEEP_VARIABLES[v][0])
+    label, default_start, default_stop = SWEEP_VARIABLES[variable]
+    lower, upper = CONTINUOUS_RANGES[variable]
+    start, stop = st.slider("Range", min_value=lower, max_value=upper, value=(default_start, default_stop),
+                            key=f"sweep_range_{variable}")
+    points = st.slider("Points", min_value=10, max_value=500, value=200, step=10)
+    
+    try:
+        sweep = score_sweep(base_patient, variable, start, stop, points, model_version, model, client)
+    except APIError as e:
+        st.error(f"Could not score the sweep: {str(e)}")
+        return
+    
+    fig = px.line(sweep, x=variable, y="probability", title=f"Diabetes Risk vs {label}")
+    fig.add_hline(y=0.5, line_dash="dash", line_color="#f44336", annotation_text="Decision threshold")
+    fig.add_vline(x=base_patient[variable], line_dash="dot", line_color="#666", annotation_text="Patient")
+    fig.update_layout(height=400, xaxis_title=label, yaxis_title="Probability of diabetes", yaxis_range=[0, 1])
+    st.plotly_chart(fig, use_container_width=True)
+    
+    flips = np.flatnonzero(np.diff(sweep["prediction"].to_numpy()))
+    if len(flips):
+        crossings = ", ".join(f"{sweep[variable].iloc[i + 1]:.1f}" for i in flips)
+        st.info(f"The prediction changes at {label} ≈ {crossings}")
+    else:
+        risk = "HIGH RISK" if sweep["prediction"].iloc[0] == 1 else "LOW RISK"
+        st.info(f"The prediction stays {risk} across this range")
+
+def render_single_tab(submitted, patient_data, age, hypertension, heart_disease, bmi, hba1c_level,
+                      blood_glucose_level, smoking_history, model=None, client=None, api_health=None):
+    """Single-patient assessment from the sidebar form, with model information alongside"""
     # Main content area
     col1, col2 = st.columns([2, 1])
     
@@ -413,36 +552,10 @@ def main():
             """, unsafe_allow_html=True)
         
         if submitted:
-            # Prepare data for prediction
-            patient_data = {
-                "gender": gender,
-                "age": float(age),
-                "hypertension": 1 if hypertension == "Yes" else 0,
-                "heart_disease": 1 if heart_disease == "Yes" else 0,
-                "bmi": float(bmi),
-                "hba1c_level": float(hba1c_level),
-                "blood_glucose_level": float(blood_glucose_level),
-                "smoking_history": smoking_history
-            }
-            
-            # Prepare input data
-            input_data = prepare_input_data(
-                patient_data["gender"],
-                patient_data["age"],
-                patient_data["hypertension"],
-                patient_data["heart_disease"],
-                patient_data["bmi"],
-                patient_data["hba1c_level"],
-                patient_data["blood_glucose_level"],
-                patient_data["smoking_history"]
-            )
-            
             # Make prediction
             with st.spinner("Analyzing patient data..."):
                 try:
-                    prediction_proba = model.predict(input_data, verbose=0)[0][0]
-                    prediction = 1 if prediction_proba > 0.5 else 0
-                    confidence = get_confidence_level(prediction_proba)
+                    prediction, prediction_proba, confidence = predict_patient(patient_data, model, client)
                     
                     # Risk level
                     risk_level = "HIGH RISK" if prediction == 1 else "LOW RISK"
@@ -514,25 +627,35 @@ def main():
     with col2:
         st.markdown("### Model Information")
         
+        if client is not None:
+            api_model = api_health["model"]
+            n_features = api_model["input_features"]
+            model_source = client.base_url
+            model_type = f"Prediction API ({api_model['inference_backend']} backend, version {api_model['model_version']})"
+        else:
+            n_features = 12
+            model_source = "notebooks/model.h5"
+            model_type = "Direct Loading"
+        
         # Model stats
-        st.markdown("""
+        st.markdown(f"""
         <div class="metric-card">
             <h4>🧠 Neural Network Model</h4>
             <p><strong>Architecture:</strong> 3-layer deep network</p>
             <p><strong>Performance:</strong> 89% recall</p>
-            <p><strong>Features:</strong> 12 health metrics</p>
+            <p><strong>Features:</strong> {n_features} health metrics</p>
             <p><strong>Type:</strong> Binary classification</p>
-            <p><strong>Model:</strong> model.h5 (loaded directly)</p>
+            <p><strong>Model:</strong> {"served by the prediction API" if client is not None else "model.h5 (loaded directly)"}</p>
         </div>
         """, unsafe_allow_html=True)
         
         # Model Status
-        st.markdown("""
+        st.markdown(f"""
         <div class="metric-card">
             <h4>🔗 Model Status</h4>
             <p><strong>Status:</strong> ✅ Loaded</p>
-            <p><strong>Source:</strong> notebooks/model.h5</p>
-            <p><strong>Type:</strong> Direct Loading</p>
+            <p><strong>Source:</strong> {model_source}</p>
+            <p><strong>Type:</strong> {model_type}</p>
         </div>
         """, unsafe_allow_html=True)
         
@@ -553,12 +676,88 @@ def main():
         )
         fig.update_layout(height=300)
         st.plotly_chart(fig, use_container_width=True)
+
+def main():
+    model = None
+    client = None
+    api_health = None
+    if PREDICTION_MODE == "api":
+        client = get_api_client()
+        try:
+            api_health = client.health()
+        except APIError as e:
+            st.error(f"❌ {str(e)}")
+            st.stop()
+        if api_health["status"] != "healthy":
+            st.error(f"❌ The prediction API at {client.base_url} has no model loaded.")
+            st.stop()
+        if not api_health["model"].get("trained", False):
+            st.warning(
+                f"⚠️ The prediction API at {client.base_url} is serving an untrained placeholder model with "
+                "random weights, so its predictions are meaningless. Train one with `python -m train.run` "
+                "or run the app with PREDICTION_MODE=local."
+            )
+    else:
+        # Load model
+        with st.spinner("Loading diabetes prediction model..."):
+            model = load_model()
+        
+        if model is None:
+            st.error("❌ Could not load the model. Please check if model.h5 exists in the notebooks folder.")
+            st.stop()
+    
+    # Sidebar
+    st.sidebar.title("Patient Information")
+    st.sidebar.markdown("Enter the patient's health metrics below:")
+    
+    # Input form
+    with st.sidebar.form("patient_form"):
+        gender = st.selectbox("Gender", ["Female", "Male"], format_func=lambda x: f"{'👩' if x == 'Female' else '👨'} {x}")
+        age = st.slider("Age", min_value=0, max_value=120, value=45)
+        hypertension = st.selectbox("Hypertension", ["No", "Yes"], format_func=lambda x: f"{'❌' if x == 'No' else '⚠️'} {x}")
+        heart_disease = st.selectbox("Heart Disease", ["No", "Yes"], format_func=lambda x: f"{'❌' if x == 'No' else '⚠️'} {x}")
+        bmi = st.slider("BMI (Body Mass Index)", min_value=10.0, max_value=100.0, value=25.0, step=0.1)
+        hba1c_level = st.slider("HbA1c Level", min_value=0.0, max_value=20.0, value=5.2, step=0.1)
+        blood_glucose_level = st.slider("Blood Glucose Level", min_value=0.0, max_value=500.0, value=120.0, step=1.0)
+        smoking_history = st.selectbox("Smoking History", 
+                                     ["never", "No Info", "current", "former", "ever", "not current"], 
+                                     format_func=lambda x: f"{'🚬' if x in ['current', 'former', 'ever'] else '❌'} {x}")
+        
+        submitted = st.form_submit_button("🔍 Predict Diabetes Risk", use_container_width=True)
+    
+    patient_data = {
+        "gender": gender,
+        "age": float(age),
+        "hypertension": 1 if hypertension == "Yes" else 0,
+        "heart_disease": 1 if heart_disease == "Yes" else 0,
+        "bmi": float(bmi),
+        "hba1c_level": float(hba1c_level),
+        "blood_glucose_level": float(blood_glucose_level),
+        "smoking_history": smoking_history
+    }
+    # Cached bulk and sweep results are only reused for the same model
+    if client is not None:
+        model_version = f"api-{api_health['model']['model_version']}"
+    else:
+        model_version = f"local-{os.path.getmtime(os.path.join('notebooks', 'model.h5'))}"
+    
+    tab_single, tab_bulk, tab_sweep = st.tabs(["🩺 Single Patient", "📁 Bulk Upload", "📈 What-if Sweep"])
+    
+    with tab_bulk:
+        render_bulk_upload(model, client, model_version)
+    
+    with tab_sweep:
+        render_sweep(patient_data, model, client, model_version)
+    
+    with tab_single:
+        render_single_tab(submitted, patient_data, age, hypertension, heart_disease, bmi, hba1c_level,
+                          blood_glucose_level, smoking_history, model, client, api_health)
     
     # Footer
     st.markdown("---")
-    st.markdown("""
+    st.markdown(f"""
     <div style="text-align: center; color: #666;">
-        <p>🏥 Diabetes Prediction System | Developed by Group 2 - Infnet Neural Networks Course | Direct Model Loading</p>
+        <p>🏥 Diabetes Prediction System | Developed by Group 2 - Infnet Neural Networks Course | {"Prediction API" if client is not None else "Direct Model Loading"}</p>
         <p>⚠️ This tool is for educational purposes only. Consult healthcare professionals for medical advice.</p>
     </div>
     """, unsafe_allow_html=True)
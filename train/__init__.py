@@ -0,0 +1,3 @@
+"""
+Reproducible training of the diabetes model, extracted from notebooks/deeper_model.ipynb
+"""
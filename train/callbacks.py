@@ -0,0 +1,148 @@
+"""
+Keras callbacks used by the training runs
+"""
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+
+class EpochTimer(tf.keras.callbacks.Callback):
+    """Records the wall time of every epoch in ``epoch_seconds``"""
+
+    def __init__(self, verbose: bool = True):
+        super().__init__()
+        self.verbose = verbose
+        self.epoch_seconds = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._started = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = time.perf_counter() - self._started
+        self.epoch_seconds.append(seconds)
+        if self.verbose:
+            metrics = " ".join(f"{name}={value:.4f}" for name, value in (logs or {}).items())
+            print(f"Epoch {epoch + 1}: {seconds:.2f}s {metrics}")
+
+
+def save_weights_checkpoint(weights: List[np.ndarray], path: str):
+    """Write a list of weight arrays atomically as an uncompressed .npz"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, *weights)
+    os.replace(tmp_path, path)
+
+
+def load_weights_checkpoint(model, path: str):
+    """Restore weights written by CustomEarlyStopping's ``checkpoint_path``"""
+    with np.load(path) as checkpoint:
+        model.set_weights([checkpoint[f"arr_{i}"] for i in range(len(checkpoint.files))])
+
+
+class CustomEarlyStopping(tf.keras.callbacks.Callback):
+    """
+    Stop once ``monitor`` has not improved by ``min_improvement`` for ``patience`` epochs.
+
+    ``mode`` is "min" or "max"; "auto" minimizes monitors with "loss" in their name and
+    maximizes the rest. The weights of the best epoch, by any margin, are kept in memory
+    and restored when training ends, whether it stopped early or ran out of epochs. With ``checkpoint_path`` every
+    new best is also written to disk on a background thread, without holding up training
+    (see load_weights_checkpoint). Progress is printed every ``log_every`` epochs, 0 only
+    reports the stop.
+    """
+
+    def __init__(self, monitor: str = "val_accuracy", min_improvement: float = 0.02, patience: int = 10,
+                 mode: str = "auto", restore_best_weights: bool = True, checkpoint_path: Optional[str] = None,
+                 log_every: int = 10):
+        super().__init__()
+        if mode == "auto":
+            mode = "min" if "loss" in monitor.lower() else "max"
+        if mode not in ("min", "max"):
+            raise ValueError(f"Invalid early stopping mode: {mode}")
+        self.monitor = monitor
+        self.min_improvement = abs(min_improvement)
+        self.patience = patience
+        self.mode = mode
+        self.restore_best_weights = restore_best_weights
+        self.checkpoint_path = checkpoint_path
+        self.log_every = log_every
+        self._writer = None
+        self._pending: Optional[Future] = None
+
+    def on_train_begin(self, logs=None):
+        self.best_score = np.inf if self.mode == "min" else -np.inf
+        # Score of the last improvement by at least min_improvement, which resets the patience
+        self.reference_score = self.best_score
+        self.best_epoch = -1
+        self.best_weights = None
+        self.stopped_epoch = -1
+        self.wait = 0
+        self._reported_missing = False
+        if self.checkpoint_path and self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+
+    def _better(self, score: float, than: float, margin: float = 0.0) -> bool:
+        if self.mode == "min":
+            return score < than - margin
+        return score > than + margin
+
+    def _current_score(self, logs) -> Optional[float]:
+        score = logs.get(self.monitor)
+        if score is None:
+            # Fall back to the training metric when there is no validation data
+            score = logs.get(self.monitor.replace("val_", ""))
+        return score
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+        score = self._current_score(logs)
+        if score is None:
+            if not self._reported_missing:
+                print(f"Early stopping: {self.monitor} not found in logs. Available metrics: {list(logs)}")
+                self._reported_missing = True
+            return
+
+        if self._better(score, self.best_score):
+            self.best_score = float(score)
+            self.best_epoch = epoch
+            if self.restore_best_weights or self.checkpoint_path:
+                # get_weights() returns host copies, so later epochs cannot change them
+                self.best_weights = self.model.get_weights()
+            if self.checkpoint_path:
+                self._checkpoint(self.best_weights)
+        if self._better(score, self.reference_score, self.min_improvement):
+            self.reference_score = float(score)
+            self.wait = 0
+        else:
+            self.wait += 1
+
+        if self.log_every and (epoch + 1) % self.log_every == 0:
+            print(f"Epoch {epoch + 1}: {self.monitor} {float(score):.4f} "
+                  f"(best {self.best_score:.4f} at epoch {self.best_epoch + 1}, wait {self.wait}/{self.patience})")
+
+        if self.wait >= self.patience:
+            self.stopped_epoch = epoch
+            self.model.stop_training = True
+
+    def _checkpoint(self, weights: List[np.ndarray]):
+        # Only the newest best matters: drop a write that has not started yet
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending = self._writer.submit(save_weights_checkpoint, weights, self.checkpoint_path)
+
+    def on_train_end(self, logs=None):
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+            self._pending = None
+        if self.stopped_epoch >= 0:
+            print(f"Early stopping at epoch {self.stopped_epoch + 1}: "
+                  f"best {self.monitor} {self.best_score:.4f} at epoch {self.best_epoch + 1}")
+        if self.restore_best_weights and self.best_weights is not None:
+            self.model.set_weights(self.best_weights)
@@ -0,0 +1,36 @@
+"""
+Training configuration: the knobs at the top of deeper_model.ipynb
+"""
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+
+class TrainingConfig(BaseModel):
+    """One training run; defaults reproduce the notebook's best model"""
+
+    balance_treatment_type: Literal["undersampling", "oversampling", "stratified"] = "oversampling"
+    positive_fraction: float = Field(0.5, gt=0, lt=1)  # Share of diabetic rows in every "stratified" batch
+    random_state: int = 42
+    dataset_test_size: float = Field(0.2, gt=0, lt=1)
+    learning_rate: float = Field(0.001, gt=0)
+    epochs: int = Field(200, ge=1)
+    batch_size: int = Field(256, ge=1)
+    # The notebook compiles with focal_loss whatever loss_function says, so "focal" is the default here
+    loss_function: Literal["focal", "binary_crossentropy"] = "focal"
+    activation_function: str = "relu"
+    output_activation_function: str = "sigmoid"
+    optimizer_type: Literal["adam", "sgd", "rmsprop"] = "adam"
+
+    # Focal loss
+    gamma: float = 2.0
+    alpha: float = Field(0.75, ge=0, le=1)  # alpha > 0.5 favours recall
+
+    # Early stopping: stop once ``early_stopping_monitor`` has not improved by
+    # ``min_improvement`` for ``early_stopping_patience`` epochs
+    early_stopping_patience: int = Field(20, ge=1)
+    min_improvement: float = 0.02
+    early_stopping_monitor: str = "recall"
+
+    # Units of the Dense layers before the single sigmoid output
+    hidden_layers: List[int] = [10, 64, 32, 16]
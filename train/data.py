@@ -0,0 +1,114 @@
+"""
+Training data: encoding, scaling, class balancing and the tf.data input pipeline
+"""
+import math
+from typing import Iterator
+
+import numpy as np
+
+from app.models.schemas import CONTINUOUS_FEATURES, FEATURE_NAMES
+from app.services.artifacts import scaler_feature_stats
+
+CONTINUOUS_INDICES = [FEATURE_NAMES.index(name) for name in CONTINUOUS_FEATURES]
+
+
+def fit_scaler(features: np.ndarray):
+    """StandardScaler over the continuous features, in CONTINUOUS_FEATURES order like the API expects"""
+    from sklearn.preprocessing import StandardScaler
+
+    return StandardScaler().fit(features[:, CONTINUOUS_INDICES].astype(np.float64))
+
+
+def scale_features(features: np.ndarray, scaler) -> np.ndarray:
+    """Standardize raw (N, 8) features exactly as the serving engines do"""
+    mean, scale = scaler_feature_stats(scaler)
+    return ((features - mean) / scale).astype(np.float32)
+
+
+class ClassBalancedSampler:
+    """
+    Row indices of one training epoch, rebalanced without copying any rows.
+
+    Every epoch draws a fresh sample, so the classes mix differently each time:
+
+    - ``oversampling``: every majority row plus as many minority draws with replacement
+      (the notebook's apply_oversampling)
+    - ``undersampling``: every minority row plus as many majority rows without replacement
+      (the notebook's apply_undersampling)
+    - ``stratified``: epochs the size of the data whose batches each hold exactly
+      ``positive_fraction`` minority rows, cycling through both classes without replacement
+    """
+
+    def __init__(self, labels: np.ndarray, method: str, batch_size: int, seed: int = 42,
+                 positive_fraction: float = 0.5):
+        if method not in ("oversampling", "undersampling", "stratified"):
+            raise ValueError(f"Invalid balance treatment type: {method}")
+        self.method = method
+        self.batch_size = batch_size
+        self.negatives = np.flatnonzero(labels == 0)
+        self.positives = np.flatnonzero(labels == 1)
+        if not len(self.negatives) or not len(self.positives):
+            raise ValueError("Balancing needs rows of both classes")
+        self.positives_per_batch = min(batch_size - 1, max(1, round(batch_size * positive_fraction)))
+        self.rng = np.random.RandomState(seed)
+
+    @property
+    def epoch_size(self) -> int:
+        """Rows per epoch"""
+        if self.method == "oversampling":
+            return 2 * max(len(self.negatives), len(self.positives))
+        if self.method == "undersampling":
+            return 2 * min(len(self.negatives), len(self.positives))
+        return self.steps * self.batch_size
+
+    @property
+    def steps(self) -> int:
+        """Batches per epoch"""
+        if self.method == "stratified":
+            return math.ceil((len(self.negatives) + len(self.positives)) / self.batch_size)
+        return math.ceil(self.epoch_size / self.batch_size)
+
+    def _cycle(self, rows: np.ndarray, count: int) -> np.ndarray:
+        """``count`` rows taken from back-to-back shuffles of ``rows``, so each repeats as rarely as possible"""
+        permutations = [self.rng.permutation(rows) for _ in range(math.ceil(count / len(rows)))]
+        return np.concatenate(permutations)[:count]
+
+    def epoch_indices(self) -> np.ndarray:
+        """Shuffled row indices of the next epoch"""
+        if self.method == "stratified":
+            positives = self._cycle(self.positives, self.steps * self.positives_per_batch)
+            negatives = self._cycle(self.negatives, self.steps * (self.batch_size - self.positives_per_batch))
+            return np.concatenate([
+                positives.reshape(self.steps, -1), negatives.reshape(self.steps, -1)
+            ], axis=1).reshape(-1)
+        majority, minority = sorted([self.negatives, self.positives], key=len, reverse=True)
+        if self.method == "oversampling":
+            rows = np.concatenate([majority, minority[self.rng.randint(0, len(minority), size=len(majority))]])
+        else:
+            rows = np.concatenate([minority, self.rng.choice(majority, size=len(minority), replace=False)])
+        return self.rng.permutation(rows)
+
+    def batches(self) -> Iterator[np.ndarray]:
+        """Index batches of the next epoch"""
+        rows = self.epoch_indices()
+        for start in range(0, len(rows), self.batch_size):
+            yield rows[start:start + self.batch_size]
+
+
+def make_dataset(features: np.ndarray, labels: np.ndarray, sampler: ClassBalancedSampler) -> "tf.data.Dataset":
+    """
+    Prefetched batches of (features, label) gathered from one in-memory copy of the rows.
+
+    Only index batches flow through the pipeline; each pass over the dataset asks the
+    sampler for a new epoch.
+    """
+    import tensorflow as tf
+
+    features = tf.constant(features, dtype=tf.float32)
+    labels = tf.constant(labels.astype(np.float32).reshape(-1, 1))
+    dataset = tf.data.Dataset.from_generator(sampler.batches, output_signature=tf.TensorSpec([None], tf.int64))
+    # Generators have unknown length; without it Keras stops the first epoch with a "ran out of data" warning
+    dataset = dataset.apply(tf.data.experimental.assert_cardinality(sampler.steps))
+    dataset = dataset.map(lambda rows: (tf.gather(features, rows), tf.gather(labels, rows)),
+                          num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,45 @@
+"""
+Model, loss and optimizer of deeper_model.ipynb
+"""
+from app.models.schemas import FEATURE_NAMES
+from train.config import TrainingConfig
+
+
+def focal_loss(gamma: float = 2.0, alpha: float = 0.25):
+    """Binary focal loss; ``alpha`` weights the positive class"""
+    import tensorflow as tf
+
+    def focal_loss_fixed(y_true, y_pred):
+        epsilon = tf.keras.backend.epsilon()
+        y_pred = tf.clip_by_value(y_pred, epsilon, 1. - epsilon)
+
+        alpha_t = y_true * alpha + (1 - y_true) * (1 - alpha)
+        p_t = y_true * y_pred + (1 - y_true) * (1 - y_pred)
+        focal_weight = alpha_t * tf.pow((1 - p_t), gamma)
+
+        focal_loss = focal_weight * tf.keras.losses.binary_crossentropy(y_true, y_pred)
+        return tf.reduce_mean(focal_loss)
+    return focal_loss_fixed
+
+
+def build_optimizer(config: TrainingConfig):
+    from tensorflow.keras.optimizers import SGD, Adam, RMSprop
+
+    optimizers = {"adam": Adam, "sgd": SGD, "rmsprop": RMSprop}
+    return optimizers[config.optimizer_type](learning_rate=config.learning_rate)
+
+
+def build_model(config: TrainingConfig):
+    """Compiled Dense network over the eight API features"""
+    from tensorflow.keras import Input
+    from tensorflow.keras.layers import Dense
+    from tensorflow.keras.models import Sequential
+
+    model = Sequential(
+        [Input(shape=(len(FEATURE_NAMES),))]
+        + [Dense(units, activation=config.activation_function) for units in config.hidden_layers]
+        + [Dense(1, activation=config.output_activation_function)]
+    )
+    loss = focal_loss(config.gamma, config.alpha) if config.loss_function == "focal" else config.loss_function
+    model.compile(optimizer=build_optimizer(config), loss=loss, metrics=["recall"])
+    return model
@@ -0,0 +1,232 @@
+"""
+Parallel hyperparameter search over TrainingConfig
+
+Usage:
+    python -m train.search --strategy grid --output trials.csv
+    python -m train.search --strategy random --trials 40 --workers 4 --threads-per-worker 2
+    python -m train.search --strategy halving --trials 27 --min-epochs 5 --eta 3 --space space.json
+
+Candidates train in worker processes with their TensorFlow thread pools capped, so several
+run side by side without oversubscribing the CPU. Every candidate is scored on a validation
+slice carved from the training rows; the notebooks' held-out 20% is never looked at. Losers
+stop early twice over: each run has the config's early stopping, and successive halving
+only gives the best 1/eta of every rung a larger epoch budget.
+
+Every trial is appended to the results CSV as it finishes, with its parameters, metrics,
+epochs and wall time.
+"""
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.evaluation import holdout_indices, load_labeled_dataset
+from train.config import TrainingConfig
+
+# The knobs deeper_model.ipynb was tuned by hand over
+DEFAULT_SPACE = {
+    "optimizer_type": ["adam", "rmsprop", "sgd"],
+    "learning_rate": [0.0003, 0.001, 0.003],
+    "loss_function": ["focal", "binary_crossentropy"],
+    "gamma": [1.0, 2.0, 3.0],
+    "alpha": [0.5, 0.75, 0.9],
+    "hidden_layers": [[10, 64, 32, 16], [32, 32], [64, 64, 32]],
+    "balance_treatment_type": ["oversampling", "undersampling", "stratified"],
+}
+
+METRICS = ("auc", "recall")
+
+# Per-process state, set up by _init_worker
+_data = None
+
+
+def _init_worker(dataset_path: str, threads: int):
+    """Cap TensorFlow's thread pools before its runtime starts and load the dataset once"""
+    global _data
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    # Memory-mapped from the preprocessed cache, so workers share the page cache
+    features, labels = load_labeled_dataset(dataset_path, settings.DATASET_CACHE_DIR)
+    train_rows, _ = holdout_indices(len(labels), settings.HOLDOUT_FRACTION)
+    _data = features[train_rows], labels[train_rows]
+
+
+def run_trial(trial: dict) -> dict:
+    """Train one candidate and score it on the validation slice of the training rows"""
+    from train.run import fit_model, prepare_split, score_model
+
+    started = time.perf_counter()
+    config = TrainingConfig(**trial["config"])
+    features, labels = _data
+    _, (train_features, train_labels), (validation_features, validation_labels) = prepare_split(
+        features, labels, config
+    )
+    model, epoch_seconds, _ = fit_model(config, train_features, train_labels, verbose=False)
+    metrics = score_model(model, validation_features, validation_labels)
+    return {
+        "trial": trial["trial"],
+        "rung": trial["rung"],
+        "max_epochs": config.epochs,
+        "epochs": len(epoch_seconds),
+        **metrics,
+        "mean_epoch_seconds": float(np.mean(epoch_seconds)),
+        "seconds": time.perf_counter() - started,
+        "params": trial["params"],
+    }
+
+
+def grid_candidates(space: Dict[str, list]) -> List[dict]:
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_candidates(space: Dict[str, list], n_trials: int, seed: int = 42) -> List[dict]:
+    """Up to ``n_trials`` distinct random picks from the grid"""
+    grid = grid_candidates(space)
+    picks = np.random.RandomState(seed).permutation(len(grid))[:n_trials]
+    return [grid[i] for i in picks]
+
+
+class ResultsTable:
+    """Appends trial rows to a CSV as they finish, so an interrupted search keeps its results"""
+
+    def __init__(self, path: str, param_names: List[str]):
+        self.path = path
+        self.columns = ["trial", "rung", "max_epochs", "epochs", *METRICS, "mean_epoch_seconds", "seconds",
+                        *param_names]
+        self.rows = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerow(self.columns)
+
+    def add(self, result: dict):
+        row = {**{key: value for key, value in result.items() if key != "params"}, **result["params"]}
+        self.rows.append(row)
+        with open(self.path, "a", newline="") as f:
+            csv.DictWriter(f, self.columns).writerow(
+                {name: json.dumps(value) if isinstance(value, list) else value for name, value in row.items()}
+            )
+
+
+class SearchRunner:
+    """Runs candidates on a pool of capped-thread worker processes"""
+
+    def __init__(self, base: TrainingConfig, dataset_path: str = settings.DATASET_PATH,
+                 workers: Optional[int] = None, threads_per_worker: int = 1):
+        self.base = base
+        self.threads_per_worker = threads_per_worker
+        self.workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+        # Build the cache once here instead of racing to build it in every worker
+        load_labeled_dataset(dataset_path, settings.DATASET_CACHE_DIR)
+        # spawn gives every worker a TensorFlow runtime it can still configure
+        context = multiprocessing.get_context("spawn")
+        self.pool = context.Pool(self.workers, initializer=_init_worker, initargs=(dataset_path, threads_per_worker))
+        self.trial_count = 0
+
+    def run(self, candidates: List[dict], epochs: int, rung: int = 0) -> Iterator[dict]:
+        """Train every candidate for up to ``epochs``, yielding results as they finish"""
+        trials = []
+        for params in candidates:
+            config = self.base.model_copy(update={**params, "epochs": epochs})
+            trials.append({"trial": self.trial_count, "rung": rung, "params": params,
+                           "config": config.model_dump()})
+            self.trial_count += 1
+        return self.pool.imap_unordered(run_trial, trials)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+def search(strategy: str, space: Dict[str, list], base: TrainingConfig, output: str,
+           dataset_path: str = settings.DATASET_PATH, n_trials: int = 20, workers: Optional[int] = None,
+           threads_per_worker: int = 1, metric: str = "auc", min_epochs: int = 5, eta: int = 3) -> List[dict]:
+    """Run a grid, random or successive-halving search, returning every trial row best first"""
+    unknown = [name for name in space if name not in TrainingConfig.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown TrainingConfig fields in search space: {', '.join(unknown)}")
+    if strategy == "grid":
+        candidates = grid_candidates(space)
+    elif strategy in ("random", "halving"):
+        candidates = random_candidates(space, n_trials, base.random_state)
+    else:
+        raise ValueError(f"Unknown search strategy: {strategy}")
+
+    table = ResultsTable(output, list(space))
+    runner = SearchRunner(base, dataset_path, workers, threads_per_worker)
+    try:
+        if strategy != "halving":
+            for result in runner.run(candidates, base.epochs):
+                table.add(result)
+                print(f"Trial {result['trial']}: {metric} {result[metric]:.4f} "
+                      f"({result['epochs']} epochs, {result['seconds']:.1f}s)")
+        else:
+            epochs, rung = min_epochs, 0
+            while candidates:
+                results = []
+                for result in runner.run(candidates, min(epochs, base.epochs), rung):
+                    table.add(result)
+                    results.append(result)
+                results.sort(key=lambda result: result[metric], reverse=True)
+                print(f"Rung {rung}: {len(results)} candidates at {min(epochs, base.epochs)} epochs, "
+                      f"best {metric} {results[0][metric]:.4f}")
+                if len(results) == 1 or epochs >= base.epochs:
+                    break
+                candidates = [result["params"] for result in results[:max(1, len(results) // eta)]]
+                epochs, rung = epochs * eta, rung + 1
+    finally:
+        runner.close()
+
+    return sorted(table.rows, key=lambda row: (row["rung"], row[metric]), reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search training hyperparameters in parallel")
+    parser.add_argument("--strategy", choices=["grid", "random", "halving"], default="random")
+    parser.add_argument("--space", help="JSON file mapping TrainingConfig fields to candidate values")
+    parser.add_argument("--config", help="JSON file of fixed TrainingConfig fields")
+    parser.add_argument("--dataset", default=settings.DATASET_PATH)
+    parser.add_argument("--output", default="trials.csv", help="Results table (CSV)")
+    parser.add_argument("--trials", type=int, default=20, help="Candidates for random and halving")
+    parser.add_argument("--epochs", type=int, help="Epoch budget per trial (the last rung's, for halving)")
+    parser.add_argument("--min-epochs", type=int, default=5, help="Epoch budget of the first halving rung")
+    parser.add_argument("--eta", type=int, default=3, help="Halving keeps the best 1/eta of each rung")
+    parser.add_argument("--metric", choices=METRICS, default="auc", help="Validation metric to maximize")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPUs / threads)")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="TensorFlow threads per worker")
+    args = parser.parse_args(argv)
+
+    space = DEFAULT_SPACE
+    if args.space:
+        with open(args.space) as f:
+            space = json.load(f)
+    fields = {}
+    if args.config:
+        with open(args.config) as f:
+            fields = json.load(f)
+    if args.epochs is not None:
+        fields["epochs"] = args.epochs
+    base = TrainingConfig(**fields)
+
+    started = time.perf_counter()
+    rows = search(args.strategy, space, base, args.output, args.dataset, args.trials, args.workers,
+                  args.threads_per_worker, args.metric, args.min_epochs, args.eta)
+    print(f"{len(rows)} trials in {time.perf_counter() - started:.1f}s, results in {args.output}")
+    for row in rows[:5]:
+        params = ", ".join(f"{name}={row[name]}" for name in space)
+        print(f"  {args.metric} {row[args.metric]:.4f} recall {row['recall']:.4f} ({row['epochs']} epochs): {params}")
+
+
+if __name__ == "__main__":
+    main()